@@ -1,19 +1,54 @@
-import torch
-
-print(f"PyTorch version: {torch.__version__}")
-print(f"CUDA available: {torch.cuda.is_available()}")
-
-if torch.cuda.is_available():
-    print(f"CUDA version built with PyTorch: {torch.version.cuda}")
-    print(f"Number of GPUs: {torch.cuda.device_count()}")
-    if torch.cuda.device_count() > 0:
-        print(f"Current GPU index: {torch.cuda.current_device()}")
-        print(f"GPU name: {torch.cuda.get_device_name(torch.cuda.current_device())}")
-else:
-    print("CUDA is not available. PyTorch cannot use your GPU.")
-
-# Check for MPS (Apple Silicon GPU) as well, just in case
-if hasattr(torch.backends, "mps") and torch.backends.mps.is_available():
-    print("MPS (Apple Silicon GPU) is available.")
-else:
-    print("MPS (Apple Silicon GPU) is not available or not configured.")
+from dataclasses import dataclass
+from typing import Optional
+
+
+@dataclass
+class GPUInfo:
+    """Result of probing the GPUs visible to PyTorch"""
+    torch_version: str
+    cuda_available: bool
+    cuda_version: Optional[str] = None
+    device_count: int = 0
+    current_device: Optional[int] = None
+    device_name: Optional[str] = None
+    mps_available: bool = False
+
+
+def probe_gpu() -> GPUInfo:
+    """Probe CUDA and MPS availability; torch is only imported (and CUDA initialized) when this is called"""
+    import torch
+
+    info = GPUInfo(torch_version=torch.__version__, cuda_available=torch.cuda.is_available())
+    if info.cuda_available:
+        info.cuda_version = torch.version.cuda
+        info.device_count = torch.cuda.device_count()
+        if info.device_count > 0:
+            info.current_device = torch.cuda.current_device()
+            info.device_name = torch.cuda.get_device_name(info.current_device)
+    # Check for MPS (Apple Silicon GPU) as well, just in case
+    info.mps_available = hasattr(torch.backends, "mps") and torch.backends.mps.is_available()
+    return info
+
+
+def main():
+    info = probe_gpu()
+    print(f"PyTorch version: {info.torch_version}")
+    print(f"CUDA available: {info.cuda_available}")
+
+    if info.cuda_available:
+        print(f"CUDA version built with PyTorch: {info.cuda_version}")
+        print(f"Number of GPUs: {info.device_count}")
+        if info.device_count > 0:
+            print(f"Current GPU index: {info.current_device}")
+            print(f"GPU name: {info.device_name}")
+    else:
+        print("CUDA is not available. PyTorch cannot use your GPU.")
+
+    if info.mps_available:
+        print("MPS (Apple Silicon GPU) is available.")
+    else:
+        print("MPS (Apple Silicon GPU) is not available or not configured.")
+
+
+if __name__ == "__main__":
+    main()
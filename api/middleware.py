@@ -0,0 +1,38 @@
+from starlette.datastructures import Headers
+from starlette.middleware.gzip import GZipResponder
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+
+class JSONGZipMiddleware:
+    """Gzip JSON responses of at least minimum_size bytes.
+
+    Unlike Starlette's GZipMiddleware, other content types (audio files, the SSE event stream)
+    are passed through untouched: audio barely compresses and a gzip stream would hold back events.
+    """
+    def __init__(self, app: ASGIApp, minimum_size: int = 1024, compresslevel: int = 4) -> None:
+        self.app = app
+        self.minimum_size = minimum_size
+        self.compresslevel = compresslevel
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "http" and "gzip" in Headers(scope=scope).get("Accept-Encoding", ""):
+            responder = _JSONGZipResponder(self.app, self.minimum_size, compresslevel=self.compresslevel)
+            await responder(scope, receive, send)
+            return
+        await self.app(scope, receive, send)
+
+
+class _JSONGZipResponder(GZipResponder):
+    """GZipResponder that only compresses responses whose content type is JSON"""
+    def __init__(self, app: ASGIApp, minimum_size: int, compresslevel: int = 4) -> None:
+        super().__init__(app, minimum_size, compresslevel=compresslevel)
+        self.passthrough = False
+
+    async def send_with_gzip(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            content_type = Headers(raw=message["headers"]).get("content-type", "")
+            self.passthrough = not content_type.startswith("application/json")
+        if self.passthrough:
+            await self.send(message)
+            return
+        await super().send_with_gzip(message)
@@ -1,18 +1,30 @@
 from typing import List, Optional, Literal, Dict
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 
 
 class TTSTaskRequest(BaseModel):
     """Request model for creating a TTS task"""
+    model_config = ConfigDict(extra="ignore", frozen=True)
+
     text: str = Field(..., description="Text to be converted to speech")
     output_path: str = Field(..., description="Output directory path for the generated audio file")
+    prompt_path: Optional[str] = Field(None, description="Optional specific prompt audio file to use")
     infer_mode: Optional[Literal["普通推理", "批次推理"]] = Field("普通推理", description="Inference mode")
 
 
+class TTSStreamRequest(BaseModel):
+    """Request model for streaming TTS synthesis"""
+    model_config = ConfigDict(extra="ignore", frozen=True)
+
+    text: str = Field(..., description="Text to be converted to speech")
+    prompt_path: Optional[str] = Field(None, description="Optional specific prompt audio file to use")
+
+
 class TTSTaskResponse(BaseModel):
     """Response model for a TTS task creation"""
     task_id: str = Field(..., description="Task ID")
     status: str = Field(..., description="Task status")
+    eta_ms: Optional[int] = Field(None, description="Estimated milliseconds until the task finishes, if known")
 
 
 class TTSTaskStatusResponse(BaseModel):
@@ -26,6 +38,8 @@ class TTSTaskStatusResponse(BaseModel):
 
 class BatchTTSTaskRequest(BaseModel):
     """Request model for creating a batch TTS task"""
+    model_config = ConfigDict(extra="ignore", frozen=True)
+
     output_directory: str = Field(..., description="Output directory path for all generated audio files")
     speeches: Dict[str, str] = Field(..., description="Dictionary of filename to text content pairs")
     prompt_path: Optional[str] = Field(None, description="Optional specific prompt audio file to use")
@@ -37,6 +51,7 @@ class BatchTTSTaskResponse(BaseModel):
     task_id: str = Field(..., description="Task ID")
     status: str = Field(..., description="Task status")
     total_files: int = Field(..., description="Total number of files to process")
+    eta_ms: Optional[int] = Field(None, description="Estimated milliseconds until the task finishes, if known")
 
 
 class BatchTTSTaskStatusResponse(BaseModel):
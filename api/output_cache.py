@@ -0,0 +1,93 @@
+import os
+import shutil
+import hashlib
+import threading
+import unicodedata
+import logging
+from collections import OrderedDict
+from typing import Optional
+
+logger = logging.getLogger("output_cache")
+
+
+def _link_or_copy(src: str, dst: str):
+    """Hardlink src to dst, falling back to a copy across filesystems"""
+    if os.path.lexists(dst):
+        os.remove(dst)
+    try:
+        os.link(src, dst)
+    except OSError:
+        shutil.copyfile(src, dst)
+
+
+class OutputCache:
+    """LRU cache of synthesized audio files keyed by a hash of text, prompt and inference mode"""
+    def __init__(self, cache_dir: str = "outputs/cache", max_entries: int = 512):
+        self.cache_dir = cache_dir
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, str]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        os.makedirs(self.cache_dir, exist_ok=True)
+        # Pick up entries left by previous runs, least recently written first
+        files = [entry for entry in os.scandir(self.cache_dir) if entry.name.endswith((".wav", ".mp3"))]
+        for entry in sorted(files, key=lambda entry: entry.stat().st_mtime):
+            self._entries[entry.name] = entry.path
+        self._evict()
+        logger.info(f"Output cache at {self.cache_dir} holds {len(self._entries)} entries")
+
+    @staticmethod
+    def make_key(text: str, prompt_path: str, infer_mode: str, output_path: str) -> Optional[str]:
+        """Hash the normalized text, prompt file and inference mode; None if the prompt cannot be read
+        
+        The key is also the cache filename and ends with the output's extension, since the audio format
+        follows it (.wav and .mp3 outputs of the same text are different files).
+        """
+        try:
+            # Include the prompt mtime so replacing a prompt file invalidates its entries
+            prompt_mtime = os.stat(prompt_path).st_mtime_ns
+        except OSError:
+            return None
+        ext = os.path.splitext(output_path)[1].lower()
+        normalized = unicodedata.normalize("NFC", text).strip()
+        digest = hashlib.sha256(f"{normalized}|{prompt_path}|{prompt_mtime}|{infer_mode}|{ext}".encode("utf-8")).hexdigest()
+        return f"{digest}{ext}"
+
+    def fetch(self, key: str, output_path: str) -> bool:
+        """Place the cached audio for key at output_path, returning False on a miss"""
+        with self._lock:
+            cache_path = self._entries.get(key)
+            if cache_path is None:
+                return False
+            self._entries.move_to_end(key)
+        try:
+            os.makedirs(os.path.dirname(output_path) or ".", exist_ok=True)
+            _link_or_copy(cache_path, output_path)
+        except OSError as e:
+            logger.warning(f"Failed to reuse cached output {cache_path}: {str(e)}")
+            with self._lock:
+                self._entries.pop(key, None)
+            return False
+        return True
+
+    def store(self, key: str, output_path: str):
+        """Add a freshly synthesized output file to the cache"""
+        cache_path = os.path.join(self.cache_dir, key)
+        try:
+            _link_or_copy(output_path, cache_path)
+        except OSError as e:
+            logger.warning(f"Failed to cache output {output_path}: {str(e)}")
+            return
+        with self._lock:
+            self._entries[key] = cache_path
+            self._entries.move_to_end(key)
+            self._evict()
+
+    def _evict(self):
+        """Drop least recently used entries beyond max_entries"""
+        while len(self._entries) > self.max_entries:
+            _, cache_path = self._entries.popitem(last=False)
+            try:
+                os.remove(cache_path)
+            except OSError:
+                pass
@@ -1,13 +1,21 @@
 import os
-import random
+import re
 import asyncio
 import time
+import uuid
+import struct
+import pathlib
+import orjson
+from contextlib import aclosing
 from typing import List, Dict, Optional
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, HTTPException, Depends, Request, Response, BackgroundTasks
+from fastapi.responses import ORJSONResponse, StreamingResponse, FileResponse
+from pydantic import BaseModel
 import logging
 
 from .models import (
     TTSTaskRequest,
+    TTSStreamRequest,
     TTSTaskResponse,
     TTSTaskStatusResponse,
     PromptsResponse,
@@ -16,270 +24,561 @@ from .models import (
     BatchTTSTaskResponse,
     BatchTTSTaskStatusResponse
 )
-from .task_manager import TaskManager, TaskStatus
+from .task_manager import TaskManager, TaskStatus, TaskKind, TTSTask, BatchTTSTask
 
-# Create API router
-router = APIRouter(prefix="/api/tts")
-
-# Global task manager instance that will be set by api_server.py
-_task_manager = None
-
-lock = asyncio.Lock()
+# Create API router; responses are serialized with orjson
+router = APIRouter(prefix="/api/tts", default_response_class=ORJSONResponse)
 
 # Global for prompt index tracking
 PROMPT_INDEX_FILE = "prompt_last_index.txt"  # Stores the last used prompt index, relative to project root
 logger = logging.getLogger(__name__)
 
-# Helper function to get the next prompt sequentially
-def get_next_sequential_prompt_path() -> Optional[str]:
-    # Construct path to prompt_last_index.txt in the project's root directory (one level up from 'api')
-    project_root_path = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
-    index_file_path = os.path.join(project_root_path, PROMPT_INDEX_FILE)
-    
-    prompts_dir = os.path.join(os.path.dirname(__file__), "..", "prompts")
-    prompts_dir = os.path.abspath(prompts_dir)
-    os.makedirs(prompts_dir, exist_ok=True) # Ensure prompts directory exists
+# Paths resolved once at import instead of on every request
+_API_DIR = pathlib.Path(__file__).resolve().parent
+_PROMPTS_DIR = (_API_DIR.parent / "prompts").resolve()
+_INDEX_FILE = _API_DIR.parent / PROMPT_INDEX_FILE
+_PROMPTS_DIR.mkdir(exist_ok=True)
+
+# Sample rate of the audio produced by IndexTTS
+_SAMPLE_RATE = 24000
+
+# Audio file extensions accepted as prompts; prompt files are managed by the server and must use lowercase extensions
+_AUDIO_EXTS = frozenset({".wav", ".mp3"})
+_AUDIO_EXT_RE = re.compile(r"\.(?:wav|mp3)\Z", re.IGNORECASE)
+
+# Sorted prompt filenames, their positions and full paths, only rescanned when the prompts directory mtime changes
+_prompt_cache = {"mtime": 0, "checked": 0.0, "names": [], "index": {}, "paths": []}
+
+# Seconds the cached listing is trusted before the directory mtime is checked again
+_PROMPT_CACHE_TTL = 2.0
+_prompt_scan_lock = asyncio.Lock()
+
+
+def invalidate_prompt_cache():
+    """Force the next prompt lookup to rescan the prompts directory (call after adding or removing prompts)"""
+    _prompt_cache.update(mtime=0, checked=0.0)
+
+
+def _rescan_prompts() -> List[str]:
+    """List the prompt audio files in the prompts directory, sorted by name"""
+    return sorted(f for f in os.listdir(_PROMPTS_DIR) if os.path.splitext(f)[1] in _AUDIO_EXTS)
+
+
+async def _get_prompts_cached(revalidate: bool = False) -> List[str]:
+    """Get the available prompt filenames, rescanning the directory off the event loop only when it changed
     
-    available_prompts = sorted([
-        f for f in os.listdir(prompts_dir) 
-        if f.lower().endswith(('.wav', '.mp3'))
-    ])
+    Within _PROMPT_CACHE_TTL of the last check the listing is returned without touching the filesystem,
+    unless revalidate is set. Concurrent callers wait for a rescan in progress instead of getting the old listing.
+    """
+    if not revalidate and time.monotonic() - _prompt_cache["checked"] < _PROMPT_CACHE_TTL:
+        return _prompt_cache["names"]
+    checked = _prompt_cache["checked"]
+    async with _prompt_scan_lock:
+        if _prompt_cache["checked"] > checked:
+            # Another request refreshed the listing while this one waited for the lock
+            return _prompt_cache["names"]
+        now = time.monotonic()
+        try:
+            mtime = _PROMPTS_DIR.stat().st_mtime_ns
+        except FileNotFoundError:
+            _prompt_cache.update(mtime=0, checked=now, names=[], index={}, paths=[])
+            return []
+        if mtime != _prompt_cache["mtime"]:
+            # Record the mtime seen before scanning so a change during the scan triggers another rescan
+            names = await asyncio.to_thread(_rescan_prompts)
+            _prompt_cache.update(
+                mtime=mtime,
+                names=names,
+                index={name: i for i, name in enumerate(names)},
+                # Full paths are built once per rescan rather than joined on every request
+                paths=[str(_PROMPTS_DIR / name) for name in names]
+            )
+        # Only mark the listing fresh once it has been updated
+        _prompt_cache["checked"] = now
+    return _prompt_cache["names"]
 
-    if not available_prompts:
-        logger.warning("No prompts available in the prompts directory for sequential selection.")
-        return None
 
-    last_index = -1
+async def warm_prompt_cache():
+    """Scan the prompts directory once, so the first requests after startup find the listing ready"""
+    await _get_prompts_cached(revalidate=True)
+
+# Seconds to wait before persisting the prompt index, so bursts of requests result in a single write
+_INDEX_FLUSH_DELAY = 0.5
+
+
+def _read_prompt_index(index_file_path: pathlib.Path) -> int:
+    """Read the last used prompt index, or -1 to start from the beginning"""
     try:
-        if os.path.exists(index_file_path):
-            with open(index_file_path, "r") as f:
-                content = f.read().strip()
-                if content.isdigit():
-                    last_index = int(content)
-                else:
-                    logger.warning(f"Content of {index_file_path} is not a digit: '{content}'. Resetting index.")
-        else:
-            logger.info(f"{index_file_path} not found. Will start from the beginning.")
-    except Exception as e:
+        with open(index_file_path, "r") as f:
+            content = f.read().strip()
+    except FileNotFoundError:
+        logger.info(f"{index_file_path} not found. Will start from the beginning.")
+        return -1
+    except OSError as e:
         logger.error(f"Error reading prompt index file {index_file_path}: {e}. Resetting index.")
-        # Continue with last_index = -1, effectively starting from the beginning
+        return -1
+    if not content.isdigit():
+        logger.warning(f"Content of {index_file_path} is not a digit: '{content}'. Resetting index.")
+        return -1
+    return int(content)
 
-    next_index = (last_index + 1) % len(available_prompts)
 
+def _write_prompt_index(index: int):
+    """Write the last used prompt index to disk"""
     try:
-        with open(index_file_path, "w") as f:
-            f.write(str(next_index))
-    except Exception as e:
-        logger.error(f"Error writing prompt index file {index_file_path}: {e}")
+        with open(_INDEX_FILE, "w") as f:
+            f.write(str(index))
+    except OSError as e:
         # If writing fails, the next run might reuse the same prompt or an older index,
         # but the application should continue to function.
+        logger.error(f"Error writing prompt index file {_INDEX_FILE}: {e}")
+
+
+# The index is read once at import and kept in memory; the file is only a persisted copy
+_last_prompt_index = _read_prompt_index(_INDEX_FILE)
+_index_lock = asyncio.Lock()
+_index_flush_task: Optional[asyncio.Task] = None
+
+
+async def _flush_prompt_index():
+    """Persist the latest prompt index after the debounce delay"""
+    global _index_flush_task
+    await asyncio.sleep(_INDEX_FLUSH_DELAY)
+    # Clear the handle before writing so an update arriving during the write schedules a new flush
+    _index_flush_task = None
+    await asyncio.to_thread(_write_prompt_index, _last_prompt_index)
+
+
+def _schedule_prompt_index_flush():
+    """Schedule a debounced write of the prompt index unless one is already pending"""
+    global _index_flush_task
+    if _index_flush_task is None:
+        _index_flush_task = asyncio.create_task(_flush_prompt_index())
+
+
+def save_prompt_index():
+    """Write the prompt index to disk immediately (used on shutdown)"""
+    _write_prompt_index(_last_prompt_index)
+
+
+# Helper function to get the next prompt sequentially
+async def get_next_sequential_prompt_path() -> Optional[str]:
+    global _last_prompt_index
+    available_prompts = await _get_prompts_cached()
+    prompt_paths = _prompt_cache["paths"]
+
+    if not available_prompts:
+        logger.warning("No prompts available in the prompts directory for sequential selection.")
+        return None
+
+    async with _index_lock:
+        next_index = (_last_prompt_index + 1) % len(available_prompts)
+        _last_prompt_index = next_index
+    _schedule_prompt_index_flush()
 
     selected_prompt_name = available_prompts[next_index]
     logger.info(f"Sequentially selected prompt: {selected_prompt_name} at index {next_index}")
-    return os.path.join(prompts_dir, selected_prompt_name)
+    return prompt_paths[next_index]
+
+
+async def _resolve_prompt_path(requested: Optional[str]) -> str:
+    """Resolve a user-provided prompt filename, falling back to sequential selection"""
+    if requested:
+        # User provided a specific prompt filename (relative to prompts directory); the cached listing
+        # already holds every valid prompt, so validation is a dict lookup instead of a stat call
+        await _get_prompts_cached()
+        position = _prompt_cache["index"].get(requested)
+        if position is None:
+            # The prompt may have been added since the listing was last checked
+            await _get_prompts_cached(revalidate=True)
+            position = _prompt_cache["index"].get(requested)
+        if position is not None:
+            potential_path = _prompt_cache["paths"][position]
+            logger.info(f"Using user-provided prompt: {potential_path}")
+            return potential_path
+        logger.warning(
+            f"User-provided prompt path '{requested}' not found or invalid in '{_PROMPTS_DIR}'. "
+            f"A prompt will be selected sequentially."
+        )
+
+    # No valid user prompt provided, or none provided at all, select sequentially
+    prompt_path = await get_next_sequential_prompt_path()
+    if not prompt_path:
+        logger.error("No prompt audio files available for sequential selection, and none were provided or valid.")
+        raise HTTPException(
+            status_code=400,
+            detail="No prompt audio files found in the 'prompts' directory, and none could be automatically selected."
+        )
+    return prompt_path
 
 
-def set_task_manager(task_manager_instance: TaskManager):
-    """Set the global task manager instance"""
-    global _task_manager
-    _task_manager = task_manager_instance
+def _wav_stream_header(sample_rate: int, channels: int = 1, bits_per_sample: int = 16) -> bytes:
+    """Build a PCM WAV header for a stream of unknown length"""
+    block_align = channels * bits_per_sample // 8
+    # RIFF and data chunk sizes are set to the maximum since the final length is not known up front
+    return struct.pack(
+        "<4sI4s4sIHHIIHH4sI",
+        b"RIFF", 0xFFFFFFFF, b"WAVE",
+        b"fmt ", 16, 1, channels, sample_rate, sample_rate * block_align, block_align, bits_per_sample,
+        b"data", 0xFFFFFFFF
+    )
 
 
-def get_task_manager() -> TaskManager:
-    """Get the global task manager instance"""
-    global _task_manager
-    if _task_manager is None:
-        # This should not happen as the task_manager should be set by api_server.py
+# Tasks already answered with 202 whose creation is still running in the background,
+# so polling right after the POST finds a pending task instead of a 404
+_accepted_tasks: Dict[str, object] = {}
+
+
+async def _finalize_task(task_manager: TaskManager, placeholder, create, **kwargs):
+    """Register an accepted task with the task manager, which also creates its output directory"""
+    try:
+        # The task manager touches the filesystem, so keep that off the event loop
+        await asyncio.to_thread(create, task_id=placeholder.task_id, **kwargs)
+    except Exception as e:
+        logger.error(f"Failed to create accepted task {placeholder.task_id}: {str(e)}")
+        placeholder.status = TaskStatus.FAILED
+        placeholder.end_time = time.time()
+        if placeholder.kind == TaskKind.BATCH:
+            placeholder.errors.append({"filename": "", "error": str(e)})
+        else:
+            placeholder.error = str(e)
+        # Hand the failed task to the task manager, whose retention limit expires it like other finished tasks;
+        # that takes its lock, which is held during snapshot writes, so keep it off the event loop too
+        await asyncio.to_thread(task_manager.add_failed_task, placeholder)
+    _accepted_tasks.pop(placeholder.task_id, None)
+
+
+def _accept_task(background: BackgroundTasks, task_manager: TaskManager, placeholder, create, **kwargs) -> str:
+    """Track a placeholder for a new task and finish creating it after the 202 response is sent
+    
+    Returns the URL of the task's status, for the Location header.
+    """
+    _accepted_tasks[placeholder.task_id] = placeholder
+    background.add_task(_finalize_task, task_manager, placeholder, create, **kwargs)
+    return f"{router.prefix}/tasks/{placeholder.task_id}"
+
+
+def _model_response(model: BaseModel, status_code: int = 200, headers: Optional[Dict[str, str]] = None) -> ORJSONResponse:
+    """Serialize a response model built from server-side data, skipping FastAPI's re-validation of the return value"""
+    return ORJSONResponse(model.model_dump(), status_code=status_code, headers=headers)
+
+
+async def get_task_manager(request: Request) -> TaskManager:
+    """Get the task manager the application's lifespan stores on app.state, waiting for it during startup"""
+    task_manager = getattr(request.app.state, "task_manager", None)
+    if task_manager is not None:
+        return task_manager
+    startup = getattr(request.app.state, "task_manager_startup", None)
+    if startup is None:
+        # This should not happen as the task_manager is created by api_server.py's lifespan
         # But as a fallback, we'll create a new one
-        _task_manager = TaskManager()
-    return _task_manager
+        task_manager = request.app.state.task_manager = TaskManager()
+        return task_manager
+    # Shielded so a client disconnecting while it waits does not cancel the startup
+    return await asyncio.shield(startup)
 
 
 @router.get("/health", response_model=HealthResponse)
 async def health_check():
     """Health check endpoint"""
-    return {"status": "ok"}
+    return _model_response(HealthResponse.model_construct(status="ok"))
+
+
+@router.get("/ready", response_model=HealthResponse, responses={503: {"model": HealthResponse}})
+async def readiness_check(request: Request):
+    """Readiness endpoint: 503 until the task manager is up and a TTS model has loaded"""
+    task_manager = getattr(request.app.state, "task_manager", None)
+    if task_manager is None or not task_manager.ready:
+        return _model_response(HealthResponse.model_construct(status="starting"), status_code=503)
+    return _model_response(HealthResponse.model_construct(status="ready"))
 
 
 @router.get("/prompts", response_model=PromptsResponse)
 async def get_prompts():
     """Get available prompt audio files"""
-    # Ensure prompts directory exists
-    os.makedirs("prompts", exist_ok=True)
-    
     # List all wav and mp3 files in the prompts directory
-    prompts = [f for f in os.listdir("prompts") if f.lower().endswith(('.wav', '.mp3'))]
+    prompts = await _get_prompts_cached()
     
-    return {"prompts": prompts}
+    return _model_response(PromptsResponse.model_construct(prompts=prompts))
 
 
-@router.post("/tasks", response_model=TTSTaskResponse)
+@router.post("/tasks", response_model=TTSTaskResponse, status_code=202)
 async def create_task(
     request: TTSTaskRequest,
+    background: BackgroundTasks,
     task_manager: TaskManager = Depends(get_task_manager)
 ):
-    async with lock:
-        """Create a new TTS task"""
-        # Determine prompt path
-        prompt_path_to_use = None
-        # Define prompts_dir for validation if user provides a prompt_path
-        prompts_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "prompts"))
-
-        if request.prompt_path:
-            # User provided a specific prompt filename (relative to prompts directory)
-            potential_path = os.path.join(prompts_dir, request.prompt_path)
-            if os.path.isfile(potential_path) and potential_path.lower().endswith(('.wav', '.mp3')):
-                prompt_path_to_use = potential_path
-                logger.info(f"Using user-provided prompt: {prompt_path_to_use}")
-            else:
-                logger.warning(
-                    f"User-provided prompt path '{request.prompt_path}' not found or invalid in '{prompts_dir}'. "
-                    f"A prompt will be selected sequentially."
-                )
-
-        if not prompt_path_to_use:
-            # No valid user prompt provided, or none provided at all, select sequentially
-            prompt_path_to_use = get_next_sequential_prompt_path()
-            if not prompt_path_to_use:
-                logger.error("No prompt audio files available for sequential selection, and none were provided or valid.")
-                raise HTTPException(
-                    status_code=400,
-                    detail="No prompt audio files found in the 'prompts' directory, and none could be automatically selected."
-                )
-            logger.info(f"Sequentially selected prompt: {prompt_path_to_use}")
-
-        # Get available prompts
-        prompts_dir = os.path.join(os.path.dirname(__file__), "..", "prompts")
-        prompts_dir = os.path.abspath(prompts_dir)
-        os.makedirs(prompts_dir, exist_ok=True)
-
-        # Generate a timestamp-based filename
-        timestamp = time.strftime("%Y%m%d_%H%M%S")
-        generated_filename = f"{timestamp}.wav"
-
-        # Use the requested output path directly without adding an output folder
-        output_dir = request.output_path
-        os.makedirs(output_dir, exist_ok=True)
-        final_output_path = os.path.join(output_dir, generated_filename)
-
-        # Create the task
-        task_id = task_manager.create_task(
-            text=request.text,
-            prompt_path=prompt_path_to_use,
-            output_path=final_output_path,
-            infer_mode=request.infer_mode
-        )
+    """Create a new TTS task; it is registered after the 202 response is sent"""
+    # Determine prompt path
+    prompt_path_to_use = await _resolve_prompt_path(request.prompt_path)
+
+    # Generate a unique filename; second-resolution timestamps collided for concurrent requests
+    generated_filename = f"{time.time_ns()}_{uuid.uuid4().hex[:8]}.wav"
+
+    # Use the requested output path directly without adding an output folder
+    output_dir = request.output_path
+    final_output_path = os.path.join(output_dir, generated_filename)
+
+    task_id = uuid.uuid4().hex
+    placeholder = TTSTask(task_id, request.text, prompt_path_to_use, final_output_path, request.infer_mode)
+    location = _accept_task(
+        background, task_manager, placeholder, task_manager.create_task,
+        text=request.text,
+        prompt_path=prompt_path_to_use,
+        output_path=final_output_path,
+        infer_mode=request.infer_mode
+    )
+
+    return _model_response(
+        TTSTaskResponse.model_construct(
+            task_id=task_id, status=TaskStatus.PENDING, eta_ms=task_manager.estimate_ms(len(request.text))
+        ),
+        status_code=202,
+        headers={"Location": location}
+    )
+
+
+@router.post("/tasks/stream")
+async def create_task_stream(
+    request: TTSStreamRequest,
+    task_manager: TaskManager = Depends(get_task_manager)
+):
+    """Synthesize speech and stream it back as WAV while it is being generated"""
+    prompt_path_to_use = await _resolve_prompt_path(request.prompt_path)
 
-        return {"task_id": task_id, "status": TaskStatus.PENDING}
+    async def wav_stream():
+        # Send the header right away so playback can start with the first sentence
+        yield _wav_stream_header(_SAMPLE_RATE)
+        async for pcm in task_manager.synthesize_iter(request.text, prompt_path_to_use):
+            yield pcm
 
+    return StreamingResponse(
+        wav_stream(),
+        media_type="audio/wav",
+        headers={"X-Sample-Rate": str(_SAMPLE_RATE)}
+    )
 
-@router.post("/batch_tasks", response_model=BatchTTSTaskResponse)
+
+@router.post("/batch_tasks", response_model=BatchTTSTaskResponse, status_code=202)
 async def create_batch_task(
     request: BatchTTSTaskRequest,
+    background: BackgroundTasks,
     task_manager: TaskManager = Depends(get_task_manager)
 ):
-    async with lock:
-        logger.info(f"Received batch task creation request: {request}")
-        # Determine the prompt path to be used for the entire batch
-        prompt_path_for_batch = None
-        prompts_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "prompts"))
-        os.makedirs(prompts_dir, exist_ok=True) # Ensure prompts directory exists for validation
-
-        if request.prompt_path:
-            # User provided a specific prompt filename (relative to prompts directory)
-            potential_path = os.path.join(prompts_dir, request.prompt_path)
-            if os.path.isfile(potential_path) and potential_path.lower().endswith(('.wav', '.mp3')):
-                prompt_path_for_batch = potential_path
-                logger.info(f"Using user-provided prompt for batch: {prompt_path_for_batch}")
-            else:
-                logger.warning(
-                    f"User-provided prompt path '{request.prompt_path}' for batch not found or invalid in '{prompts_dir}'. "
-                    f"A single prompt will be selected sequentially for the entire batch."
-                )
-
-        if not prompt_path_for_batch:
-            # No valid user prompt provided for the batch, or none provided at all, select one sequentially for the whole batch
-            prompt_path_for_batch = get_next_sequential_prompt_path()
-            if not prompt_path_for_batch:
-                logger.error("No prompt audio files available for sequential selection for the batch, and none were provided or valid.")
-                raise HTTPException(
-                    status_code=400,
-                    detail="No prompt audio files found in the 'prompts' directory for batch processing, and none could be automatically selected."
-                )
-            logger.info(f"Sequentially selected prompt for the entire batch: {prompt_path_for_batch}")
-
-        # Validate output filenames
-        output_directory = request.output_directory
-        os.makedirs(output_directory, exist_ok=True)
-
-        # Validate that all filenames in speeches have .wav or .mp3 extension
-        invalid_filenames = [filename for filename in request.speeches.keys() if not filename.lower().endswith(('.wav', '.mp3'))]
-        if invalid_filenames:
-            raise HTTPException(
-                status_code=400,
-                detail=f"All filenames must end with .wav or .mp3 extension. Invalid filenames: {', '.join(invalid_filenames)}"
-            )
-
-        # Create the batch task
-        task_id = task_manager.create_batch_task(
-            speeches=request.speeches,
-            prompt_path=prompt_path_for_batch,
-            output_directory=output_directory,
-            infer_mode=request.infer_mode
+    # The full request repeats every text of the batch, so it is only formatted at debug level
+    logger.info(f"Received batch task creation request with {len(request.speeches)} files for {request.output_directory}")
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug(f"Batch task creation request: {request}")
+    # Validate that all filenames in speeches have .wav or .mp3 extension
+    invalid_filenames = [filename for filename in request.speeches if not _AUDIO_EXT_RE.search(filename)]
+    if invalid_filenames:
+        raise HTTPException(
+            status_code=400,
+            detail=f"All filenames must end with .wav or .mp3 extension. Invalid filenames: {', '.join(invalid_filenames)}"
         )
 
-        return {
-            "task_id": task_id,
-            "status": TaskStatus.PENDING,
-            "total_files": len(request.speeches)
-        }
+    # Determine the prompt path to be used for the entire batch
+    prompt_path_for_batch = await _resolve_prompt_path(request.prompt_path)
+
+    output_directory = request.output_directory
+
+    task_id = uuid.uuid4().hex
+    placeholder = BatchTTSTask(task_id, request.speeches, prompt_path_for_batch, output_directory, request.infer_mode)
+    location = _accept_task(
+        background, task_manager, placeholder, task_manager.create_batch_task,
+        speeches=request.speeches,
+        prompt_path=prompt_path_for_batch,
+        output_directory=output_directory,
+        infer_mode=request.infer_mode
+    )
+
+    return _model_response(
+        BatchTTSTaskResponse.model_construct(
+            task_id=task_id, status=TaskStatus.PENDING, total_files=len(request.speeches),
+            eta_ms=task_manager.estimate_ms(sum(len(text) for text in request.speeches.values()))
+        ),
+        status_code=202,
+        headers={"Location": location}
+    )
+
+
+def _single_task_status(task) -> TTSTaskStatusResponse:
+    """Build the status response of a regular task"""
+    response = {
+        "task_id": task.task_id,
+        "status": task.status,
+        "output_path": task.output_path,
+    }
+
+    # Add process_time if available
+    if task.process_time is not None:
+        response["process_time"] = task.process_time
+
+    # Add error if task failed
+    if task.status == TaskStatus.FAILED and task.error:
+        response["error"] = task.error
+
+    # Fields come straight from the task manager, so skip re-validating them on every poll
+    return TTSTaskStatusResponse.model_construct(**response)
+
+
+def _batch_task_status(task) -> BatchTTSTaskStatusResponse:
+    """Build the status response of a batch task"""
+    response = {
+        "task_id": task.task_id,
+        "status": task.status,
+        "output_directory": task.output_directory,
+        "total_files": task.total_files,
+        "processed_files": task.processed_files
+    }
+
+    # Add process_time if available
+    if task.process_time is not None:
+        response["process_time"] = task.process_time
+
+    # Add errors if any
+    if task.errors:
+        response["errors"] = task.errors
+
+    return BatchTTSTaskStatusResponse.model_construct(**response)
+
+
+_STATUS_BUILDERS = {
+    TaskKind.SINGLE: _single_task_status,
+    TaskKind.BATCH: _batch_task_status,
+}
+
+
+def _task_etag(task) -> str:
+    """Weak ETag that changes whenever the status response of a task would change"""
+    if task.kind == TaskKind.BATCH:
+        return f'W/"{TaskStatus(task.status).value}-{task.processed_files}-{len(task.errors)}-{task.process_time or 0}"'
+    return f'W/"{TaskStatus(task.status).value}-{task.process_time or 0}"'
 
 
 @router.get("/tasks/{task_id}", response_model=None)
 async def get_task_status(
     task_id: str,
+    request: Request,
     task_manager: TaskManager = Depends(get_task_manager)
 ):
     """Get the status of a TTS task"""
-    task = task_manager.get_task(task_id)
+    task = _accepted_tasks.get(task_id) or task_manager.get_task(task_id)
     if task is None:
         raise HTTPException(
             status_code=404,
             detail=f"Task with ID '{task_id}' not found"
         )
-    
-    # Check if it's a batch task or regular task
-    if hasattr(task, 'total_files'):  # It's a batch task
-        response = {
-            "task_id": task.task_id,
-            "status": task.status,
-            "output_directory": task.output_directory,
-            "total_files": task.total_files,
-            "processed_files": task.processed_files
-        }
-        
-        # Add process_time if available
-        if task.process_time is not None:
-            response["process_time"] = task.process_time
-        
-        # Add errors if any
-        if task.errors:
-            response["errors"] = task.errors
-        
-        return BatchTTSTaskStatusResponse(**response)
-    else:  # It's a regular task
-        response = {
-            "task_id": task.task_id,
-            "status": task.status,
-            "output_path": task.output_path,
-        }
-        
-        # Add process_time if available
-        if task.process_time is not None:
-            response["process_time"] = task.process_time
-        
-        # Add error if task failed
-        if task.status == TaskStatus.FAILED and task.error:
-            response["error"] = task.error
-        
-        return TTSTaskStatusResponse(**response)
+
+    # Let polling clients revalidate cheaply: unchanged tasks get an empty 304
+    etag = _task_etag(task)
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers)
+
+    return _model_response(_STATUS_BUILDERS[task.kind](task), headers=headers)
+
+
+# Media types of the audio files the tasks produce, by extension
+_AUDIO_MEDIA_TYPES = {".wav": "audio/wav", ".mp3": "audio/mpeg"}
+
+
+@router.get("/tasks/{task_id}/audio")
+async def get_task_audio(
+    task_id: str,
+    filename: Optional[str] = None,
+    task_manager: TaskManager = Depends(get_task_manager)
+):
+    """Download the audio of a completed task; batch tasks also take the filename of one of their speeches"""
+    task = _accepted_tasks.get(task_id) or task_manager.get_task(task_id)
+    if task is None:
+        raise HTTPException(
+            status_code=404,
+            detail=f"Task with ID '{task_id}' not found"
+        )
+    if task.status != TaskStatus.COMPLETED:
+        raise HTTPException(
+            status_code=409,
+            detail=f"Task with ID '{task_id}' is {TaskStatus(task.status).value}, its audio is not available"
+        )
+
+    if task.kind == TaskKind.BATCH:
+        # Only names from the batch itself are accepted, so only files this batch wrote can be downloaded
+        if filename not in task.speeches:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Query parameter 'filename' must name one of the files of batch task '{task_id}'"
+            )
+        # Names are not checked for ".." when a batch is created, so keep downloads inside its output directory
+        output_directory = os.path.abspath(task.output_directory)
+        audio_path = os.path.abspath(os.path.join(output_directory, filename))
+        if os.path.commonpath([output_directory, audio_path]) != output_directory:
+            raise HTTPException(
+                status_code=400,
+                detail=f"File '{filename}' of batch task '{task_id}' is outside its output directory"
+            )
+        # A file that failed was not written by this batch; whatever is at its path may be left from an earlier run
+        if any(error.get("filename") == filename for error in task.errors):
+            raise HTTPException(
+                status_code=404,
+                detail=f"Audio file '{filename}' of task '{task_id}' was not generated"
+            )
+    else:
+        audio_path = task.output_path
+
+    try:
+        stat_result = await asyncio.to_thread(os.stat, audio_path)
+    except OSError:
+        raise HTTPException(
+            status_code=404,
+            detail=f"Audio file of task '{task_id}' not found"
+        )
+
+    # FileResponse streams the file in 64 KB chunks rather than reading it into memory (no sendfile on this stack)
+    return FileResponse(
+        audio_path,
+        stat_result=stat_result,
+        media_type=_AUDIO_MEDIA_TYPES.get(os.path.splitext(audio_path)[1].lower(), "application/octet-stream"),
+        filename=os.path.basename(audio_path)
+    )
+
+
+# Seconds between keep-alive comments on an idle task event stream
+_EVENTS_KEEPALIVE = 5.0
+
+
+@router.get("/tasks/{task_id}/events")
+async def get_task_events(
+    task_id: str,
+    task_manager: TaskManager = Depends(get_task_manager)
+):
+    """Stream the status of a task as server-sent events, one per change, until it completes or fails"""
+    if task_id not in _accepted_tasks and task_manager.get_task(task_id) is None:
+        raise HTTPException(
+            status_code=404,
+            detail=f"Task with ID '{task_id}' not found"
+        )
+
+    async def event_stream():
+        last_etag = None
+        async with aclosing(task_manager.watch_task(task_id, _EVENTS_KEEPALIVE)) as updates:
+            async for task in updates:
+                # Once registered, the task manager's copy is current; until then only the placeholder exists
+                task = task or _accepted_tasks.get(task_id)
+                if task is None:
+                    return
+                etag = _task_etag(task)
+                if etag == last_etag:
+                    # Lets the client and any proxy see the connection is still alive
+                    yield b": keep-alive\n\n"
+                    continue
+                last_etag = etag
+                yield b"data: " + orjson.dumps(_STATUS_BUILDERS[task.kind](task).model_dump()) + b"\n\n"
+                if task.status in (TaskStatus.COMPLETED, TaskStatus.FAILED):
+                    return
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache"}
+    )
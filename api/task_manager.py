@@ -1,23 +1,57 @@
 import os
+import math
 import time
+import asyncio
 import threading
+import queue
 import uuid
-import json
-from typing import Dict, Optional, List, Literal, Any
+from collections import deque
+import orjson
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Tuple, ClassVar, Iterable
+from typing import Dict, Optional, List, Literal, Any, AsyncIterator, Callable
 from enum import Enum
 import logging
-import traceback
+
+import torch
+import torchaudio
 
 from indextts.infer import IndexTTS
+from .output_cache import OutputCache
 
-# Configure logging
+# Configure logging; the level can be overridden with INDEXTTS_LOG_LEVEL (e.g. DEBUG)
 logging.basicConfig(
-    level=logging.INFO,
+    level=os.environ.get("INDEXTTS_LOG_LEVEL", "INFO").upper(),
     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
 )
 logger = logging.getLogger("task_manager")
 
 
+def _save_audio(output_path: str, sampling_rate: int, wav_data):
+    """Save int16 samples shaped (num_samples, channels) as returned by IndexTTS, replacing any existing file"""
+    if os.path.isfile(output_path):
+        os.remove(output_path)
+    torchaudio.save(output_path, torch.from_numpy(wav_data.T), sampling_rate)
+
+
+# IndexTTS method used for each inference mode
+_INFER_FN_NAMES = {"普通推理": "infer", "批次推理": "infer_fast"}
+
+# Files of a batch task queued ahead of the replicas synthesizing them
+_BATCH_QUEUE_SIZE = 16
+
+# Weight of the latest finished task in the running average of processing seconds per character
+_RATE_SMOOTHING = 0.2
+
+
+def _task_chars(task: Any) -> int:
+    """Number of text characters a task synthesizes"""
+    if task.kind == TaskKind.BATCH:
+        return sum(len(text) for text in task.speeches.values())
+    return len(task.text)
+
+
 class TaskStatus(str, Enum):
     PENDING = "pending"
     PROCESSING = "processing"
@@ -25,19 +59,40 @@ class TaskStatus(str, Enum):
     FAILED = "failed"
 
 
+class TaskKind(str, Enum):
+    SINGLE = "single"
+    BATCH = "batch"
+
+
+# Slotted so the retained task history does not carry a __dict__ per task; eq=False keeps identity semantics
+@dataclass(slots=True, eq=False)
 class TTSTask:
     """Represents a TTS task"""
-    def __init__(self, task_id: str, text: str, prompt_path: str, output_path: str, 
-                 infer_mode: Literal["普通推理", "批次推理"] = "普通推理"):
-        self.task_id = task_id
-        self.text = text
-        self.prompt_path = prompt_path
-        self.output_path = output_path
-        self.infer_mode = infer_mode
-        self.status = TaskStatus.PENDING
-        self.start_time: Optional[float] = None
-        self.end_time: Optional[float] = None
-        self.error: Optional[str] = None
+    kind: ClassVar[TaskKind] = TaskKind.SINGLE
+
+    task_id: str
+    text: str
+    prompt_path: str
+    output_path: str
+    infer_mode: Literal["普通推理", "批次推理"] = "普通推理"
+    # Resolved once so the worker does not compare mode strings for every inference call
+    _infer_fn_name: str = field(init=False, repr=False)
+    status: TaskStatus = field(default=TaskStatus.PENDING, init=False)
+    start_time: Optional[float] = field(default=None, init=False)
+    end_time: Optional[float] = field(default=None, init=False)
+    error: Optional[str] = field(default=None, init=False)
+    # Last to_dict result with the change count it was built at; every attribute assignment bumps _changes
+    _dict_cache: Optional[Tuple[int, dict]] = field(default=None, init=False, repr=False)
+    _changes: int = field(default=0, init=False, repr=False)
+
+    def __post_init__(self):
+        self._infer_fn_name = _INFER_FN_NAMES.get(self.infer_mode, "infer_fast")
+        
+    def __setattr__(self, name: str, value: Any):
+        object.__setattr__(self, name, value)
+        if name not in ("_dict_cache", "_changes"):
+            # _changes is not assigned yet while __init__ sets the earlier fields
+            object.__setattr__(self, "_changes", getattr(self, "_changes", 0) + 1)
         
     @property
     def process_time(self) -> Optional[float]:
@@ -49,8 +104,16 @@ class TTSTask:
         return round(self.end_time - self.start_time, 2)
     
     def to_dict(self) -> dict:
-        """Convert task to dictionary for serialization"""
-        return {
+        """Convert task to dictionary for serialization, reusing the previous dict while no field changed
+        
+        The returned dict is shared and must not be modified.
+        """
+        # The count is read before the fields, so a change made while the dict is built invalidates it
+        changes = self._changes
+        cache = self._dict_cache
+        if cache is not None and cache[0] == changes:
+            return cache[1]
+        data = {
             "task_id": self.task_id,
             "text": self.text,
             "prompt_path": self.prompt_path,
@@ -61,6 +124,8 @@ class TTSTask:
             "end_time": self.end_time,
             "error": self.error
         }
+        self._dict_cache = (changes, data)
+        return data
     
     @classmethod
     def from_dict(cls, data: dict) -> 'TTSTask':
@@ -79,21 +144,37 @@ class TTSTask:
         return task
 
 
+@dataclass(slots=True, eq=False)
 class BatchTTSTask:
     """Represents a batch TTS task"""
-    def __init__(self, task_id: str, speeches: Dict[str, str], prompt_path: str, output_directory: str, 
-                 infer_mode: Literal["普通推理", "批次推理"] = "普通推理"):
-        self.task_id = task_id
-        self.speeches = speeches
-        self.prompt_path = prompt_path
-        self.output_directory = output_directory
-        self.infer_mode = infer_mode
-        self.status = TaskStatus.PENDING
-        self.start_time: Optional[float] = None
-        self.end_time: Optional[float] = None
-        self.total_files = len(speeches)
-        self.processed_files = 0
-        self.errors: List[Dict[str, str]] = []
+    kind: ClassVar[TaskKind] = TaskKind.BATCH
+
+    task_id: str
+    speeches: Dict[str, str]
+    prompt_path: str
+    output_directory: str
+    infer_mode: Literal["普通推理", "批次推理"] = "普通推理"
+    # Resolved once so the worker does not compare mode strings for every inference call
+    _infer_fn_name: str = field(init=False, repr=False)
+    status: TaskStatus = field(default=TaskStatus.PENDING, init=False)
+    start_time: Optional[float] = field(default=None, init=False)
+    end_time: Optional[float] = field(default=None, init=False)
+    total_files: int = field(init=False)
+    processed_files: int = field(default=0, init=False)
+    errors: List[Dict[str, str]] = field(default_factory=list, init=False)
+    # Last to_dict result with the change count it was built at; every attribute assignment bumps _changes
+    _dict_cache: Optional[Tuple[int, dict]] = field(default=None, init=False, repr=False)
+    _changes: int = field(default=0, init=False, repr=False)
+
+    def __post_init__(self):
+        self._infer_fn_name = _INFER_FN_NAMES.get(self.infer_mode, "infer_fast")
+        self.total_files = len(self.speeches)
+        
+    def __setattr__(self, name: str, value: Any):
+        object.__setattr__(self, name, value)
+        if name not in ("_dict_cache", "_changes"):
+            # _changes is not assigned yet while __init__ sets the earlier fields
+            object.__setattr__(self, "_changes", getattr(self, "_changes", 0) + 1)
         
     @property
     def process_time(self) -> Optional[float]:
@@ -105,8 +186,16 @@ class BatchTTSTask:
         return round(self.end_time - self.start_time, 2)
     
     def to_dict(self) -> dict:
-        """Convert task to dictionary for serialization"""
-        return {
+        """Convert task to dictionary for serialization, reusing the previous dict while no field changed
+        
+        The returned dict is shared and must not be modified.
+        """
+        # The count is read before the fields, so a change made while the dict is built invalidates it
+        changes = self._changes
+        cache = self._dict_cache
+        if cache is not None and cache[0] == changes:
+            return cache[1]
+        data = {
             "task_id": self.task_id,
             "speeches": self.speeches,
             "prompt_path": self.prompt_path,
@@ -120,6 +209,9 @@ class BatchTTSTask:
             "errors": self.errors,
             "task_type": "batch"  # Add a type field to distinguish from regular tasks
         }
+        # errors is appended to in place; the cached dict shares the list, so it stays current
+        self._dict_cache = (changes, data)
+        return data
     
     @classmethod
     def from_dict(cls, data: dict) -> 'BatchTTSTask':
@@ -140,114 +232,360 @@ class BatchTTSTask:
         return task
 
 
+class _ModelReplica:
+    """One IndexTTS instance on a device, with the lock serializing its use"""
+    def __init__(self, device: Optional[str] = None):
+        # None lets IndexTTS pick the device itself
+        self.device = device
+        self.model: Optional[IndexTTS] = None
+        self.error: Optional[str] = None
+        self.lock = threading.RLock()
+
+
 class TaskManager:
     """Manages TTS tasks"""
-    def __init__(self, model_dir: str = "checkpoints", cfg_path: str = "checkpoints/config.yaml"):
+    def __init__(self, model_dir: str = "checkpoints", cfg_path: str = "checkpoints/config.yaml",
+                 max_group_size: int = 8, output_cache_size: int = 512, journal_compact_every: int = 1000,
+                 save_interval: float = 0.5, cond_cache_size: int = 32, devices: Optional[List[str]] = None,
+                 max_tasks: Optional[int] = None):
         logger.info("Initializing TaskManager...")
         self.tasks: Dict[str, Any] = {}  # Changed to Any to support both task types
         self.model_dir = model_dir
         self.cfg_path = cfg_path
-        self.tts_model: Optional[IndexTTS] = None
+        # Maximum number of pending tasks sharing a prompt that the worker takes in one iteration
+        self.max_group_size = max_group_size
+        # Number of prompts whose speaker conditioning stays cached on the model device
+        self.cond_cache_size = cond_cache_size
+        # One model replica and worker thread per GPU; with a single GPU or none, IndexTTS picks the device
+        if devices is None:
+            gpu_count = torch.cuda.device_count()
+            devices = [f"cuda:{i}" for i in range(gpu_count)] if gpu_count > 1 else [None]
+        self.replicas = [_ModelReplica(device) for device in devices]
+        self._stream_replica_index = 0
+        # Finished tasks beyond this many are forgotten, oldest first (TASKS_MAX, 0 keeps every task)
+        self.max_tasks = int(os.environ.get("TASKS_MAX", 1000)) if max_tasks is None else max_tasks
+        # IDs of completed and failed tasks in the order they finished, guarded by self.lock
+        self._finished: deque = deque()
         self.lock = threading.Lock()
         self.tasks_file = "outputs/tasks.json"
+        # Each task mutation appends one line here; the snapshot in tasks_file is only rewritten on compaction
+        self.journal_file = "outputs/tasks.jsonl"
+        self.journal_compact_every = journal_compact_every
+        self._journal_records = 0
+        # Whether tasks_file matches the last snapshot written, and whether that snapshot was fsynced
+        self._snapshot_saved = False
+        self._snapshot_durable = False
+        # Journal records are buffered and written by the saver thread at most every save_interval seconds
+        self.save_interval = save_interval
+        self._journal_buffer: List[bytes] = []
+        self._dirty = threading.Event()
+        # Callbacks waking the status streams of each task, called on every journaled change (guarded by self.lock)
+        self._watchers: Dict[str, List[Callable[[], None]]] = {}
+        # IDs of tasks waiting for the worker, in submission order; guarded by self.lock and
+        # signalled through self._cv so the idle worker sleeps until there is work
+        self._pending: deque = deque()
+        self._cv = threading.Condition(self.lock)
+        # Pending IDs a worker has dequeued but left for a later group (guarded by self.lock)
+        self._backlog: deque = deque()
+        # Characters of the tasks still waiting for a worker, and the exponential moving average of processing
+        # seconds per character over finished tasks (None until one finishes); both guarded by self.lock
+        self._pending_chars = 0
+        self._secs_per_char: Optional[float] = None
+        # Computes prompt mel features when a task is queued so the worker finds them cached
+        self._prefetch_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="prompt-prefetch")
+        # Output directories already created by this process, so repeated tasks skip the makedirs syscalls
+        self._ensured_dirs = set()
+        # Writes batch outputs to disk while the model synthesizes the next file
+        self._io_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="output-writer")
+        # Runs streaming synthesis, one thread per replica since each replica synthesizes one stream at a time;
+        # further streams queue here instead of holding threads of the event loop's default executor
+        self._stream_executor = ThreadPoolExecutor(max_workers=len(self.replicas), thread_name_prefix="stream")
         
         # Ensure tasks directory exists
         os.makedirs(os.path.dirname(self.tasks_file), exist_ok=True)
         
-        # Load existing tasks from file
+        # Identical requests reuse earlier outputs instead of running the model again (0 disables)
+        self.output_cache = OutputCache(max_entries=output_cache_size) if output_cache_size > 0 else None
+        
+        # Load existing tasks from file, then fold the replayed journal into a fresh snapshot
         self._load_tasks()
+        # Tasks a previous run was still processing when it stopped are run again from the start
+        for task in self.tasks.values():
+            if task.status == TaskStatus.PROCESSING:
+                task.status = TaskStatus.PENDING
+                task.start_time = None
+                if isinstance(task, BatchTTSTask):
+                    task.processed_files = 0
+                    task.errors = []
+                # The snapshot below must record the reset
+                self._snapshot_saved = False
+        self._pending.extend(task_id for task_id, task in self.tasks.items() if task.status == TaskStatus.PENDING)
+        self._pending_chars = sum(_task_chars(self.tasks[task_id]) for task_id in self._pending)
+        self._journal = open(self.journal_file, "ab", buffering=0)
+        self._save_tasks()
+        
+        # Load the models once in the background; they stay resident for the lifetime of the manager.
+        # _model_ready is set when every replica's load attempt finishes.
+        self._model_ready = threading.Event()
+        self.running = True
+        self.bootstrap_thread = threading.Thread(target=self._bootstrap_model, daemon=True)
+        self.bootstrap_thread.start()
+        
+        # Start one worker thread per replica and the saver thread
+        self.worker_threads = [
+            threading.Thread(target=self._worker, args=(replica,), daemon=True) for replica in self.replicas
+        ]
+        for worker_thread in self.worker_threads:
+            worker_thread.start()
+        self.saver_thread = threading.Thread(target=self._saver, daemon=True)
+        self.saver_thread.start()
+        logger.info(f"TaskManager initialized, {len(self.worker_threads)} worker thread(s) started")
+    
+    def _save_tasks(self, durable: bool = False):
+        """Save a snapshot of all tasks to file and truncate the journal"""
+        with self.lock:
+            self._compact_locked(durable)
+    
+    def _compact_locked(self, durable: bool = False):
+        """Write the snapshot and truncate the journal; the caller must hold self.lock
         
-        # Initialize model early to avoid delays later
+        The snapshot is written to a temporary file and renamed over tasks_file, so a crash mid-write
+        leaves the previous snapshot intact. It is only fsynced when durable is set (on shutdown).
+        """
+        # Nothing was journaled since the last snapshot, so it already matches the tasks in memory
+        if self._journal_records == 0 and self._snapshot_saved and (self._snapshot_durable or not durable):
+            return
+        tasks_data = {}
+        for task_id, task in self.tasks.items():
+            tasks_data[task_id] = task.to_dict()
+        tmp_file = self.tasks_file + ".tmp"
         try:
-            logger.info("Pre-initializing TTS model...")
-            self._initialize_model()
-            logger.info("TTS model pre-initialization successful")
+            with open(tmp_file, 'wb') as f:
+                f.write(orjson.dumps(tasks_data))
+                if durable:
+                    f.flush()
+                    os.fsync(f.fileno())
+            os.replace(tmp_file, self.tasks_file)
+            self._snapshot_saved = True
+            self._snapshot_durable = durable
+            # The snapshot now holds every journaled change, including ones not written yet
+            self._journal_buffer.clear()
+            self._journal.seek(0)
+            self._journal.truncate()
+            self._journal_records = 0
+            logger.info(f"Tasks saved to {self.tasks_file}")
         except Exception as e:
-            logger.warning(f"TTS model pre-initialization failed: {str(e)}")
-            # Continue even if model initialization fails here, we'll retry later
-        
-        # Start worker thread
-        self.running = True
-        self.worker_thread = threading.Thread(target=self._worker, daemon=True)
-        self.worker_thread.start()
-        logger.info("TaskManager initialized, worker thread started")
+            logger.error(f"Error saving tasks: {str(e)}")
+    
+    def _journal_write(self, task_id: str, fields: Dict[str, Any]):
+        """Queue one task mutation for the journal; the caller must hold self.lock"""
+        self._journal_buffer.append(orjson.dumps({"id": task_id, "fields": fields}, option=orjson.OPT_APPEND_NEWLINE))
+        self._journal_records += 1
+        self._dirty.set()
+        for wake in self._watchers.get(task_id, ()):
+            wake()
     
-    def _save_tasks(self):
-        """Save tasks to file"""
+    def _flush_journal(self):
+        """Write buffered journal records, compacting instead once the journal has grown large"""
         with self.lock:
-            tasks_data = {}
-            for task_id, task in self.tasks.items():
-                tasks_data[task_id] = task.to_dict()
+            if self._journal_records >= self.journal_compact_every:
+                self._compact_locked()
+                return
+            if not self._journal_buffer:
+                return
             try:
-                with open(self.tasks_file, 'w') as f:
-                    json.dump(tasks_data, f, indent=2)
-                logger.info(f"Tasks saved to {self.tasks_file}")
+                self._journal.write(b"".join(self._journal_buffer))
             except Exception as e:
-                logger.error(f"Error saving tasks: {str(e)}")
+                logger.error(f"Error writing task journal: {str(e)}")
+            self._journal_buffer.clear()
+    
+    def _saver(self):
+        """Saver thread that coalesces bursts of task mutations into a single journal write"""
+        while self.running:
+            if not self._dirty.wait(timeout=1.0):
+                continue
+            time.sleep(self.save_interval)
+            self._dirty.clear()
+            self._flush_journal()
+    
+    def _journal_append(self, task: Any, *fields: str):
+        """Record the current values of the given task fields in the journal"""
+        with self.lock:
+            self._journal_write(task.task_id, {name: getattr(task, name) for name in fields})
     
     def _load_tasks(self):
-        """Load tasks from file"""
-        if not os.path.exists(self.tasks_file):
+        """Load tasks from the snapshot file and replay the journal on top of it"""
+        tasks_data = {}
+        if os.path.exists(self.tasks_file):
+            try:
+                with open(self.tasks_file, 'rb') as f:
+                    tasks_data = orjson.loads(f.read())
+                # A snapshot from a previous run was written on its shutdown and needs no rewrite if unchanged
+                self._snapshot_saved = self._snapshot_durable = True
+            except Exception as e:
+                logger.error(f"Error loading tasks: {str(e)}")
+                # Start with empty tasks if loading fails
+                tasks_data = {}
+        else:
             logger.info(f"Tasks file {self.tasks_file} not found, starting with empty tasks")
-            return
         
-        try:
-            with open(self.tasks_file, 'r') as f:
-                tasks_data = json.load(f)
-            
-            for task_id, task_data in tasks_data.items():
+        if os.path.exists(self.journal_file):
+            replayed = 0
+            with open(self.journal_file, 'rb') as f:
+                for line in f:
+                    try:
+                        record = orjson.loads(line)
+                    except ValueError:
+                        # A crash can leave a partially written last line behind
+                        logger.warning(f"Skipping malformed line in {self.journal_file}")
+                        continue
+                    if record.get("removed"):
+                        tasks_data.pop(record["id"], None)
+                    else:
+                        tasks_data.setdefault(record["id"], {}).update(record["fields"])
+                    replayed += 1
+            logger.info(f"Replayed {replayed} journal records from {self.journal_file}")
+            # Replayed records are not in the snapshot yet
+            self._journal_records = replayed
+        
+        for task_id, task_data in tasks_data.items():
+            try:
                 # Check if this is a batch task or regular task
                 if task_data.get("task_type") == "batch":
                     self.tasks[task_id] = BatchTTSTask.from_dict(task_data)
                 else:
                     self.tasks[task_id] = TTSTask.from_dict(task_data)
-                    
-            logger.info(f"Loaded {len(self.tasks)} tasks from {self.tasks_file}")
+            except KeyError as e:
+                logger.error(f"Error loading task {task_id}: missing field {str(e)}")
+        
+        # Drop history beyond the retention limit before the snapshot is rewritten
+        finished = [task for task in self.tasks.values() if task.status in (TaskStatus.COMPLETED, TaskStatus.FAILED)]
+        finished.sort(key=lambda task: task.end_time or 0.0)
+        with self.lock:
+            self._finished.extend(task.task_id for task in finished)
+            evicted = self._evict_finished_locked()
+        
+        logger.info(f"Loaded {len(self.tasks)} tasks from {self.tasks_file}, evicted {evicted} old finished tasks")
+    
+    def _finish_task(self, task: Any, *fields: str):
+        """Journal the final state of a completed or failed task and make it eligible for eviction"""
+        with self.lock:
+            self._journal_write(task.task_id, {name: getattr(task, name) for name in fields})
+            self._finished.append(task.task_id)
+    
+    def _evict_finished_locked(self) -> int:
+        """Forget the oldest finished tasks while more than max_tasks are held; the caller must hold self.lock"""
+        evicted = 0
+        if self.max_tasks <= 0:
+            return evicted
+        while len(self.tasks) > self.max_tasks and self._finished:
+            task_id = self._finished.popleft()
+            if self.tasks.pop(task_id, None) is not None:
+                self._journal_buffer.append(orjson.dumps({"id": task_id, "removed": True}, option=orjson.OPT_APPEND_NEWLINE))
+                self._journal_records += 1
+                evicted += 1
+        if evicted:
+            self._dirty.set()
+        return evicted
+    
+    @property
+    def ready(self) -> bool:
+        """Whether model loading has finished with at least one replica able to run tasks"""
+        return self._model_ready.is_set() and any(replica.model is not None for replica in self.replicas)
+    
+    @property
+    def tts_model(self) -> Optional[IndexTTS]:
+        """The model of the first replica"""
+        return self.replicas[0].model
+    
+    def _bootstrap_model(self):
+        """Load every model replica once at startup, in parallel"""
+        loaders = [
+            threading.Thread(target=self._bootstrap_replica, args=(replica,), daemon=True) for replica in self.replicas
+        ]
+        for loader in loaders:
+            loader.start()
+        for loader in loaders:
+            loader.join()
+        self._model_ready.set()
+    
+    def _bootstrap_replica(self, replica: _ModelReplica):
+        """Load one model replica, recording why it failed"""
+        try:
+            logger.info(f"Pre-initializing TTS model on {replica.device or 'default device'}...")
+            self._initialize_model(replica)
+            logger.info("TTS model pre-initialization successful")
         except Exception as e:
-            logger.error(f"Error loading tasks: {str(e)}")
-            # Start with empty tasks if loading fails
-            self.tasks = {}
-    
-    def _initialize_model(self):
-        """Initialize the TTS model if not already initialized"""
-        if self.tts_model is None:
-            logger.info("Initializing TTS model...")
-            try:
-                self.tts_model = IndexTTS(
-                    model_dir=self.model_dir,
-                    cfg_path=self.cfg_path
-                )
-                logger.info("TTS model initialized successfully")
-            except Exception as e:
-                logger.error(f"Failed to initialize TTS model: {str(e)}")
-                logger.error(traceback.format_exc())
-                raise
+            logger.error(f"TTS model pre-initialization failed: {str(e)}")
+            replica.error = str(e)
+    
+    def _require_model(self, replica: _ModelReplica) -> IndexTTS:
+        """Return the replica's loaded model, failing fast instead of retrying a load that already failed"""
+        self._model_ready.wait()
+        if replica.model is None:
+            raise RuntimeError(f"TTS model failed to initialize: {replica.error}")
+        return replica.model
+    
+    def _initialize_model(self, replica: _ModelReplica):
+        """Initialize the replica's TTS model if not already initialized"""
+        with replica.lock:
+            if replica.model is None:
+                logger.info("Initializing TTS model...")
+                try:
+                    tts_model = IndexTTS(
+                        model_dir=self.model_dir,
+                        cfg_path=self.cfg_path,
+                        device=replica.device
+                    )
+                    tts_model.cond_mel_cache_size = self.cond_cache_size
+                    replica.model = tts_model
+                    logger.info("TTS model initialized successfully")
+                except Exception as e:
+                    logger.exception(f"Failed to initialize TTS model: {str(e)}")
+                    raise
     
     def create_task(self, text: str, prompt_path: str, output_path: str, 
-                    infer_mode: Literal["普通推理", "批次推理"] = "普通推理") -> str:
-        """Create a new TTS task and return its ID"""
+                    infer_mode: Literal["普通推理", "批次推理"] = "普通推理",
+                    task_id: Optional[str] = None) -> str:
+        """Create a new TTS task and return its ID, generating one unless task_id is given"""
         # Ensure output directory exists
-        os.makedirs(os.path.dirname(output_path), exist_ok=True)
+        self._ensure_dir(os.path.dirname(output_path))
         
-        # Generate a unique task ID
-        task_id = f"task_{int(time.time())}_{len(self.tasks)}"
+        # An identical earlier synthesis completes the task immediately
+        cached = self._fetch_cached_output(text, prompt_path, infer_mode, output_path)
         
-        # Create and store the task
+        # Generate a unique task ID outside the lock; random IDs cannot collide between concurrent creates
+        if task_id is None:
+            task_id = uuid.uuid4().hex
         task = TTSTask(task_id, text, prompt_path, output_path, infer_mode)
+        if cached:
+            task.start_time = task.end_time = time.time()
+            task.status = TaskStatus.COMPLETED
         with self.lock:
             self.tasks[task_id] = task
+            self._journal_write(task_id, task.to_dict())
+            if cached:
+                self._finished.append(task_id)
+            else:
+                self._pending.append(task_id)
+                self._pending_chars += len(text)
+                self._cv.notify()
+            self._evict_finished_locked()
         
-        # Save tasks to file
-        self._save_tasks()
-        
-        logger.info(f"Created task {task_id} for text: {text[:30]}...")
+        if cached:
+            logger.info(f"Created task {task_id} from cached output for text: {text[:30]}...")
+        else:
+            self._prefetch_prompt(prompt_path)
+            logger.info(f"Created task {task_id} for text: {text[:30]}...")
         return task_id
     
     def create_batch_task(self, speeches: Dict[str, str], prompt_path: str, output_directory: str,
-                          infer_mode: Literal["普通推理", "批次推理"] = "普通推理") -> str:
-        """Create a new batch TTS task and return its ID"""
+                          infer_mode: Literal["普通推理", "批次推理"] = "普通推理",
+                          task_id: Optional[str] = None) -> str:
+        """Create a new batch TTS task and return its ID, generating one unless task_id is given"""
         # Generate a unique task ID
-        task_id = str(uuid.uuid4())
+        if task_id is None:
+            task_id = uuid.uuid4().hex
         
         # Create a new task
         task = BatchTTSTask(
@@ -258,20 +596,73 @@ class TaskManager:
             infer_mode=infer_mode
         )
         
+        # Ensure output directory exists
+        self._ensure_dir(output_directory)
+        
         # Add task to the tasks dictionary
         with self.lock:
             self.tasks[task_id] = task
+            self._journal_write(task_id, task.to_dict())
+            self._pending.append(task_id)
+            self._pending_chars += _task_chars(task)
+            self._cv.notify()
+            self._evict_finished_locked()
         
-        # Save tasks to file
-        self._save_tasks()
-        
+        self._prefetch_prompt(prompt_path)
         logger.info(f"Created batch task {task_id} with {len(speeches)} files")
         return task_id
     
+    def add_failed_task(self, task: Any):
+        """Record a task that failed before it could be created, so it is reported and evicted like any finished task"""
+        with self.lock:
+            self.tasks[task.task_id] = task
+            self._journal_write(task.task_id, task.to_dict())
+            self._finished.append(task.task_id)
+            self._evict_finished_locked()
+    
+    def _ensure_dir(self, directory: str):
+        """Create a directory once per process; later calls for the same directory are a set lookup"""
+        if directory and directory not in self._ensured_dirs:
+            os.makedirs(directory, exist_ok=True)
+            self._ensured_dirs.add(directory)
+    
+    def _prefetch_prompt(self, prompt_path: str):
+        """Warm the prompt feature cache of every loaded replica in the background"""
+        for replica in self.replicas:
+            if replica.model is not None:
+                self._prefetch_executor.submit(self._load_prompt_features, prompt_path, replica)
+    
+    def _load_prompt_features(self, prompt_path: str, replica: _ModelReplica):
+        """Compute and cache the conditioning mel of a prompt, logging instead of raising on failure"""
+        try:
+            self._get_cond(prompt_path, replica)
+        except Exception as e:
+            logger.warning(f"Failed to prefetch prompt {prompt_path}: {str(e)}")
+    
+    def _get_cond(self, prompt_path: str, replica: _ModelReplica):
+        """Speaker conditioning for a prompt, served from the model's LRU keyed by the prompt file contents"""
+        return replica.model.get_cond_mel(prompt_path)
+    
+    def _fetch_cached_output(self, text: str, prompt_path: str, infer_mode: str, output_path: str) -> bool:
+        """Place a cached synthesis of the same request at output_path, returning False on a miss"""
+        if self.output_cache is None:
+            return False
+        cache_key = self.output_cache.make_key(text, prompt_path, infer_mode, output_path)
+        return cache_key is not None and self.output_cache.fetch(cache_key, output_path)
+    
+    def _cache_output(self, text: str, prompt_path: str, infer_mode: str, output_path: str):
+        """Remember a finished synthesis so identical requests can reuse it"""
+        if self.output_cache is None:
+            return
+        cache_key = self.output_cache.make_key(text, prompt_path, infer_mode, output_path)
+        if cache_key is not None:
+            self.output_cache.store(cache_key, output_path)
+    
     def get_task(self, task_id: str) -> Optional[Any]:
         """Get a task by its ID"""
-        with self.lock:
-            task = self.tasks.get(task_id)
+        # Readers do not take self.lock: a single dict lookup is atomic under the GIL, and writers
+        # only ever insert or remove whole entries, so status polls never contend with the worker
+        task = self.tasks.get(task_id)
         
         if task is None:
             logger.warning(f"Task {task_id} not found")
@@ -279,8 +670,8 @@ class TaskManager:
         
         return task
     
-    def _worker(self):
-        """Worker thread that processes tasks"""
+    def _worker(self, replica: _ModelReplica):
+        """Worker thread that processes tasks on one model replica"""
         logger.info("Worker thread started")
         
         # Print debugging info about thread and process
@@ -289,50 +680,94 @@ class TaskManager:
         logger.info(f"Worker thread ID: {threading.get_ident()}")
         logger.info(f"Worker process ID: {os.getpid()}")
         
+        # Tasks queued while the model loads wait for it instead of each triggering a load
+        while self.running and not self._model_ready.wait(timeout=1.0):
+            pass
+        # Leave the tasks to the healthy replicas; if none loaded, keep going so tasks fail fast
+        if replica.model is None and any(other.model is not None for other in self.replicas):
+            logger.error(f"Worker for {replica.device} exiting: TTS model failed to initialize")
+            return
+        
         while self.running:
             try:
-                # Find the next pending task
-                next_task = None
-                task_to_save = None # Temporary variable to hold the task needing save
-                with self.lock:
-                    for task in self.tasks.values():
-                        if task.status == TaskStatus.PENDING:
-                            logger.info(f"Found pending task {task.task_id}, changing to PROCESSING")
-                            task.status = TaskStatus.PROCESSING
-                            next_task = task
-                            task_to_save = task # Mark this task for saving
-                            break
-                
-                # Save updated status outside the lock if a task was updated
-                if task_to_save:
-                    self._save_tasks() # <-- MOVE SAVE CALL HERE
+                # Take the next group of pending tasks
+                group = self._take_pending_group()
+
+                if group:
+                    logger.info(f"Found {len(group)} pending task(s) sharing a prompt")
 
-                # Process the task if one was found
-                if next_task:
+                # Process the tasks back to back so the model's reference audio cache stays warm;
+                # each task is only marked PROCESSING when it starts, so tasks left at shutdown stay PENDING
+                for i, task_id in enumerate(group):
+                    if not self.running:
+                        with self.lock:
+                            self._backlog.extendleft(reversed(group[i:]))
+                        break
+                    next_task = self._start_task(task_id)
+                    if next_task is None:
+                        continue
                     logger.info(f"Processing task {next_task.task_id}")
                     # Check if it's a batch task or regular task
                     if isinstance(next_task, BatchTTSTask):
-                        self._process_batch_task(next_task)
+                        self._process_batch_task(next_task, replica)
                     else:
-                        self._process_task(next_task)
-                else:
-                    # Sleep for a short time if no tasks are pending
-                    time.sleep(1.0)
+                        self._process_task(next_task, replica)
             except Exception as e:
-                logger.error(f"Error in worker thread: {str(e)}")
-                logger.error(traceback.format_exc())
+                logger.exception(f"Error in worker thread: {str(e)}")
                 time.sleep(5.0)  # Sleep longer after an error
     
-    def _process_task(self, task: TTSTask):
+    def _take_pending_group(self) -> List[str]:
+        """Take the IDs of the oldest pending task and further pending tasks sharing its prompt and mode"""
+        group = []
+        group_key = None
+        deferred = deque()
+        with self._cv:
+            self._cv.wait_for(lambda: not self.running or self._pending or self._backlog, timeout=5.0)
+            # Take everything queued so far so tasks sharing a prompt can be grouped
+            self._backlog.extend(self._pending)
+            self._pending.clear()
+            # Take at most a fair share of the queue, so a burst of tasks sharing a prompt is spread over
+            # every loaded replica instead of running on this one while the others sit idle
+            loaded = sum(1 for replica in self.replicas if replica.model is not None) or 1
+            group_size = min(self.max_group_size, math.ceil(len(self._backlog) / loaded))
+            while self._backlog:
+                task_id = self._backlog.popleft()
+                task = self.tasks.get(task_id)
+                if task is None or task.status != TaskStatus.PENDING:
+                    continue
+                if group_key is None:
+                    group_key = (task.prompt_path, task.infer_mode)
+                elif len(group) >= group_size or (task.prompt_path, task.infer_mode) != group_key:
+                    deferred.append(task_id)
+                    continue
+                group.append(task_id)
+            self._backlog = deferred
+            if self._backlog:
+                # Wake another idle worker for what is left
+                self._cv.notify()
+        return group
+    
+    def _start_task(self, task_id: str) -> Optional[Any]:
+        """Mark a taken task as PROCESSING, or return None if it is no longer pending"""
+        with self.lock:
+            task = self.tasks.get(task_id)
+            if task is None or task.status != TaskStatus.PENDING:
+                return None
+            task.status = TaskStatus.PROCESSING
+            self._pending_chars -= _task_chars(task)
+            self._journal_write(task.task_id, {"status": task.status})
+        return task
+    
+    def _process_task(self, task: TTSTask, replica: _ModelReplica):
         """Process a TTS task"""
         logger.info(f"Processing task {task.task_id}")
         try:
-            # Initialize the model if needed
-            self._initialize_model()
+            # Fail fast if the model could not be loaded
+            tts_model = self._require_model(replica)
             
             # Record start time
             task.start_time = time.time()
-            self._save_tasks()  # Save updated state
+            self._journal_append(task, "start_time")  # Save updated state
             
             # Log task details
             logger.info(f"Task {task.task_id} details:")
@@ -342,47 +777,43 @@ class TaskManager:
             logger.info(f"  Mode: {task.infer_mode}")
             
             # Process the task based on inference mode
-            if task.infer_mode == "普通推理":
-                logger.info(f"Using regular inference for task {task.task_id}")
-                self.tts_model.infer(
+            with replica.lock:
+                cond_mel = self._get_cond(task.prompt_path, replica)
+                logger.info(f"Using {task._infer_fn_name} for task {task.task_id}")
+                getattr(tts_model, task._infer_fn_name)(
                     audio_prompt=task.prompt_path,
                     text=task.text,
-                    output_path=task.output_path
-                )
-            else:  # 批次推理
-                logger.info(f"Using fast inference for task {task.task_id}")
-                self.tts_model.infer_fast(
-                    audio_prompt=task.prompt_path,
-                    text=task.text,
-                    output_path=task.output_path
+                    output_path=task.output_path,
+                    cond_mel=cond_mel
                 )
+            self._cache_output(task.text, task.prompt_path, task.infer_mode, task.output_path)
             
             # Record end time and update status
             task.end_time = time.time()
             task.status = TaskStatus.COMPLETED
             logger.info(f"Task {task.task_id} completed successfully in {task.process_time} seconds")
+            self._record_rate(len(task.text), task.end_time - task.start_time)
             
         except Exception as e:
             # Handle errors
-            logger.error(f"Task {task.task_id} failed: {str(e)}")
-            logger.error(traceback.format_exc())
+            logger.exception(f"Task {task.task_id} failed: {str(e)}")
             task.error = str(e)
             task.status = TaskStatus.FAILED
             task.end_time = time.time()
         
         # Save updated task state
-        self._save_tasks()
+        self._finish_task(task, "status", "start_time", "end_time", "error")
     
-    def _process_batch_task(self, task: BatchTTSTask):
+    def _process_batch_task(self, task: BatchTTSTask, replica: _ModelReplica):
         """Process a batch TTS task"""
         logger.info(f"Processing batch task {task.task_id} with {task.total_files} files")
         try:
-            # Initialize the model if needed
-            self._initialize_model()
+            # Fail fast if the model could not be loaded
+            self._require_model(replica)
             
             # Record start time
             task.start_time = time.time()
-            self._save_tasks()  # Save updated state
+            self._journal_append(task, "start_time")  # Save updated state
             
             # Log task details
             logger.info(f"Batch task {task.task_id} details:")
@@ -392,45 +823,14 @@ class TaskManager:
             logger.info(f"  Mode: {task.infer_mode}")
             
             # Ensure output directory exists
-            os.makedirs(task.output_directory, exist_ok=True)
+            self._ensure_dir(task.output_directory)
             
-            # Process each file in the batch sequentially
-            for filename, text in task.speeches.items():
-                try:
-                    # Construct full output path
-                    output_path = os.path.join(task.output_directory, filename)
-                    
-                    logger.info(f"Processing file {filename} ({task.processed_files + 1}/{task.total_files})")
-                    logger.info(f"  Text: {text[:50]}...")
-                    
-                    # Process the file based on inference mode
-                    if task.infer_mode == "普通推理":
-                        logger.info(f"Using regular inference for file {filename}")
-                        logger.info(f"DEBUG: Full text being passed to tts_model.infer for {filename}: '{text}'")
-                        self.tts_model.infer(
-                            audio_prompt=task.prompt_path,
-                            text=text,
-                            output_path=output_path
-                        )
-                    else:  # 批次推理
-                        logger.info(f"Using fast inference for file {filename}")
-                        self.tts_model.infer_fast(
-                            audio_prompt=task.prompt_path,
-                            text=text,
-                            output_path=output_path
-                        )
-                    
-                    # Increment processed files counter
-                    task.processed_files += 1
-                    # Save state after each file to track progress
-                    self._save_tasks()
-                    
-                except Exception as e:
-                    # Handle errors for individual file
-                    error_msg = str(e)
-                    logger.error(f"Error processing file {filename}: {error_msg}")
-                    task.errors.append({"filename": filename, "error": error_msg})
-                    # Continue with next file despite error
+            # Spread the files over every loaded replica; with a single replica they run in order on this thread
+            replicas = [replica] + [other for other in self.replicas if other is not replica and other.model is not None]
+            if len(replicas) == 1:
+                self._process_batch_files(task, replica, task.speeches.items())
+            else:
+                self._process_batch_files_parallel(task, replicas)
             
             # Record end time and update status
             task.end_time = time.time()
@@ -439,6 +839,7 @@ class TaskManager:
             if task.processed_files == task.total_files:
                 task.status = TaskStatus.COMPLETED
                 logger.info(f"Batch task {task.task_id} completed successfully in {task.process_time} seconds")
+                self._record_rate(_task_chars(task), task.end_time - task.start_time)
             elif task.processed_files > 0:
                 # Some files processed but not all
                 task.status = TaskStatus.COMPLETED
@@ -450,20 +851,236 @@ class TaskManager:
             
         except Exception as e:
             # Handle errors for the entire batch task
-            logger.error(f"Batch task {task.task_id} failed: {str(e)}")
-            logger.error(traceback.format_exc())
+            logger.exception(f"Batch task {task.task_id} failed: {str(e)}")
             task.errors.append({"filename": "batch_process", "error": str(e)})
             task.status = TaskStatus.FAILED
             task.end_time = time.time()
         
         # Save updated task state
-        self._save_tasks()
+        self._finish_task(task, "status", "start_time", "end_time", "processed_files", "errors")
+    
+    def _process_batch_files(self, task: BatchTTSTask, replica: _ModelReplica, files: Iterable[Tuple[str, str]]):
+        """Synthesize (filename, text) pairs of a batch task on one replica, recording progress and per-file errors"""
+        tts_model = replica.model
+        # Every file uses the same prompt and mode, so the conditioning and inference method are resolved once
+        cond_mel = None
+        infer_fn = getattr(tts_model, task._infer_fn_name)
+        
+        # Outputs still being written by the I/O pool, oldest first
+        pending_writes: List[Tuple[str, Future]] = []
+        
+        # Process the files in the order they are handed over
+        for filename, text in files:
+            try:
+                # Construct full output path; filenames may contain subdirectories
+                output_path = os.path.join(task.output_directory, filename)
+                self._ensure_dir(os.path.dirname(output_path))
+                
+                logger.info(f"Processing file {filename} ({task.processed_files + 1}/{task.total_files})")
+                logger.info(f"  Text: {text[:50]}...")
+                
+                # Reuse an identical earlier synthesis, otherwise process the file based on inference mode
+                if self._fetch_cached_output(text, task.prompt_path, task.infer_mode, output_path):
+                    logger.info(f"Reused cached output for file {filename}")
+                    self._mark_file_processed(task)
+                else:
+                    with replica.lock:
+                        if cond_mel is None:
+                            cond_mel = self._get_cond(task.prompt_path, replica)
+                        # Without an output path the model returns the audio, which is written off this thread
+                        if logger.isEnabledFor(logging.DEBUG):
+                            logger.debug(f"Full text being passed to tts_model.{task._infer_fn_name} for {filename}: '{text}'")
+                        sampling_rate, wav_data = infer_fn(
+                            audio_prompt=task.prompt_path,
+                            text=text,
+                            output_path=None,
+                            cond_mel=cond_mel
+                        )
+                    future = self._io_pool.submit(
+                        self._write_output, text, task.prompt_path, task.infer_mode, output_path,
+                        sampling_rate, wav_data
+                    )
+                    pending_writes.append((filename, future))
+                
+            except Exception as e:
+                # Handle errors for individual file
+                error_msg = str(e)
+                logger.error(f"Error processing file {filename}: {error_msg}")
+                task.errors.append({"filename": filename, "error": error_msg})
+                # Continue with next file despite error
+            
+            # Account for outputs that finished writing in the meantime
+            self._reap_writes(task, pending_writes, wait=False)
+        
+        self._reap_writes(task, pending_writes, wait=True)
+    
+    def _process_batch_files_parallel(self, task: BatchTTSTask, replicas: List[_ModelReplica]):
+        """Feed the files of a batch task through a bounded queue drained by one consumer per replica"""
+        # Bounded so the feeder stays only a few files ahead of the consumers
+        files: queue.Queue = queue.Queue(maxsize=_BATCH_QUEUE_SIZE)
+
+        def feed():
+            for item in task.speeches.items():
+                files.put(item)
+            # One end marker per consumer
+            for _ in replicas:
+                files.put(None)
+
+        threads = [threading.Thread(target=feed, daemon=True)] + [
+            threading.Thread(target=self._process_batch_files, args=(task, other, iter(files.get, None)), daemon=True)
+            for other in replicas[1:]
+        ]
+        for thread in threads:
+            thread.start()
+        # The calling worker consumes on its own replica
+        self._process_batch_files(task, replicas[0], iter(files.get, None))
+        for thread in threads:
+            thread.join()
+    
+    def _record_rate(self, chars: int, seconds: float):
+        """Fold the processing speed of a successfully finished task into the running average"""
+        if chars <= 0:
+            return
+        rate = seconds / chars
+        with self.lock:
+            if self._secs_per_char is None:
+                self._secs_per_char = rate
+            else:
+                self._secs_per_char += _RATE_SMOOTHING * (rate - self._secs_per_char)
+    
+    def estimate_ms(self, chars: int) -> Optional[int]:
+        """Estimated milliseconds until a task of this many characters submitted now finishes
+        
+        Based on the average processing speed of finished tasks and the work queued ahead of it;
+        None until a task has finished.
+        """
+        rate = self._secs_per_char
+        if rate is None:
+            return None
+        # The queued work is shared out over the replicas before the new task starts
+        return int((self._pending_chars / len(self.replicas) + chars) * rate * 1000)
+    
+    def _write_output(self, text: str, prompt_path: str, infer_mode: str, output_path: str,
+                      sampling_rate: int, wav_data):
+        """Write synthesized audio to output_path and add it to the output cache (runs in the I/O pool)"""
+        _save_audio(output_path, sampling_rate, wav_data)
+        self._cache_output(text, prompt_path, infer_mode, output_path)
+    
+    def _mark_file_processed(self, task: BatchTTSTask):
+        """Count one finished file of a batch task and record the progress"""
+        # Several replicas may finish files of the same batch concurrently
+        with self.lock:
+            task.processed_files += 1
+            # Save state after each file to track progress
+            self._journal_write(task.task_id, {"processed_files": task.processed_files})
+    
+    def _reap_writes(self, task: BatchTTSTask, pending_writes: List[Tuple[str, Future]], wait: bool):
+        """Update batch progress for finished output writes, waiting for all of them if wait is set"""
+        while pending_writes and (wait or pending_writes[0][1].done()):
+            filename, future = pending_writes.pop(0)
+            try:
+                future.result()
+            except Exception as e:
+                logger.error(f"Error writing file {filename}: {str(e)}")
+                task.errors.append({"filename": filename, "error": str(e)})
+                continue
+            self._mark_file_processed(task)
+    
+    def _next_stream_replica(self) -> _ModelReplica:
+        """Pick the replica for the next stream, round-robin over the replicas whose model loaded"""
+        self._model_ready.wait()
+        # With no loaded replica any one will do; _require_model then reports the load error
+        replicas = [replica for replica in self.replicas if replica.model is not None] or self.replicas
+        replica = replicas[self._stream_replica_index % len(replicas)]
+        self._stream_replica_index += 1
+        return replica
+    
+    async def synthesize_iter(self, text: str, prompt_path: str) -> AsyncIterator[bytes]:
+        """Synthesize text sentence by sentence, yielding 16-bit mono PCM as each sentence is decoded"""
+        loop = asyncio.get_running_loop()
+        chunks: asyncio.Queue = asyncio.Queue()
+        cancelled = threading.Event()
+
+        def produce():
+            # Runs in an executor thread; hands chunks back to the event loop as they are produced
+            try:
+                if cancelled.is_set():
+                    return  # The client went away while the stream was queued
+                replica = self._next_stream_replica()
+                tts_model = self._require_model(replica)
+                with replica.lock:
+                    cond_mel = self._get_cond(prompt_path, replica)
+                    for wav in tts_model.infer_stream(audio_prompt=prompt_path, text=text, cond_mel=cond_mel):
+                        if cancelled.is_set():
+                            break
+                        loop.call_soon_threadsafe(chunks.put_nowait, wav.short().numpy().tobytes())
+            except Exception as e:
+                logger.error(f"Streaming synthesis failed: {str(e)}")
+                loop.call_soon_threadsafe(chunks.put_nowait, e)
+            finally:
+                loop.call_soon_threadsafe(chunks.put_nowait, None)
+
+        producer = loop.run_in_executor(self._stream_executor, produce)
+        # A stream still queued at shutdown never runs produce, so end it here instead
+        producer.add_done_callback(lambda future: future.cancelled() and chunks.put_nowait(None))
+        try:
+            while True:
+                chunk = await chunks.get()
+                if chunk is None:
+                    break
+                if isinstance(chunk, Exception):
+                    raise chunk
+                yield chunk
+        finally:
+            # Stop synthesizing further sentences if the client went away
+            cancelled.set()
+    
+    async def watch_task(self, task_id: str, timeout: float) -> AsyncIterator[Optional[Any]]:
+        """Yield the task now, then again after every change to it or after timeout seconds without one
+        
+        None is yielded while no task with this ID exists (yet); the caller decides when to stop.
+        """
+        loop = asyncio.get_running_loop()
+        changed = asyncio.Event()
+
+        def wake():
+            # Runs on the thread that changed the task, with self.lock held
+            try:
+                loop.call_soon_threadsafe(changed.set)
+            except RuntimeError:
+                pass  # The event loop was closed
+
+        with self.lock:
+            self._watchers.setdefault(task_id, []).append(wake)
+        try:
+            while True:
+                # Cleared before reading the task, so a change made while the caller handles it is not missed
+                changed.clear()
+                yield self.tasks.get(task_id)
+                try:
+                    await asyncio.wait_for(changed.wait(), timeout)
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            with self.lock:
+                watchers = self._watchers[task_id]
+                watchers.remove(wake)
+                if not watchers:
+                    del self._watchers[task_id]
     
     def shutdown(self):
         """Shutdown the task manager"""
         logger.info("Shutting down task manager")
         self.running = False
-        self.worker_thread.join(timeout=5)
-        # Save tasks one last time before shutdown
-        self._save_tasks()
+        with self._cv:
+            self._cv.notify_all()
+        for worker_thread in self.worker_threads:
+            worker_thread.join(timeout=5)
+        self.saver_thread.join(timeout=5)
+        self._prefetch_executor.shutdown(wait=False, cancel_futures=True)
+        self._io_pool.shutdown(wait=True)
+        self._stream_executor.shutdown(wait=False, cancel_futures=True)
+        # Save tasks one last time before shutdown, folding the journal into the snapshot
+        self._save_tasks(durable=True)
+        self._journal.close()
         logger.info("Task manager shutdown complete")
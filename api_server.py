@@ -1,82 +1,119 @@
 import os
 import sys
+import asyncio
 import logging
 import uvicorn
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 
 os.environ["KMP_DUPLICATE_LIB_OK"] = "TRUE"
 
-# Add the current directory to the path so we can import our modules
-current_dir = os.path.dirname(os.path.abspath(__file__))
-sys.path.append(current_dir)
-
 # Import our API modules
-from api.routes import router, set_task_manager
+from api.routes import router, save_prompt_index, warm_prompt_cache
 from api.task_manager import TaskManager
+from api.middleware import JSONGZipMiddleware
 
-# Configure logging
+# Configure logging; the level can be overridden with INDEXTTS_LOG_LEVEL (e.g. DEBUG)
 logging.basicConfig(
-    level=logging.INFO,
+    level=os.environ.get("INDEXTTS_LOG_LEVEL", "INFO").upper(),
     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
 )
 logger = logging.getLogger("api_server")
 
-# Create FastAPI app
+# Create necessary directories once, when the server module is imported
+os.makedirs("prompts", exist_ok=True)
+os.makedirs("outputs/tasks", exist_ok=True)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Initialize resources on startup and clean them up on shutdown"""
+    # Initialize task manager in a worker thread and start serving right away, so health and readiness
+    # probes are answered while it loads; routes get it from app.state, waiting for it during startup
+    async def start_task_manager() -> TaskManager:
+        logger.info("Initializing task manager...")
+        try:
+            task_manager = await asyncio.to_thread(TaskManager)
+        except Exception as e:
+            logger.exception(f"Task manager initialization failed: {str(e)}")
+            raise
+        app.state.task_manager = task_manager
+        logger.info("Task manager initialized")
+        return task_manager
+
+    app.state.task_manager = None
+    app.state.task_manager_startup = asyncio.create_task(start_task_manager())
+    await warm_prompt_cache()
+    try:
+        yield
+    finally:
+        try:
+            task_manager = await app.state.task_manager_startup
+        except Exception:
+            task_manager = None
+        if task_manager is not None:
+            logger.info("Shutting down task manager...")
+            task_manager.shutdown()
+            logger.info("Task manager shutdown complete")
+        # Persist the sequential prompt index in case a debounced write is still pending
+        save_prompt_index()
+
+
+# Create FastAPI app; JSON responses are serialized with orjson
 app = FastAPI(
     title="IndexTTS API",
     description="API for IndexTTS - An Industrial-Level Controllable and Efficient Zero-Shot Text-To-Speech System",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan
 )
 
-# Add CORS middleware
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["*"],  # Allow all origins
-    allow_credentials=True,
-    allow_methods=["*"],  # Allow all methods
-    allow_headers=["*"],  # Allow all headers
-)
+# Add CORS middleware unless INDEXTTS_CORS_MODE is "proxy", for deployments where a reverse proxy adds the
+# CORS headers and the extra middleware layer would only cost time on every request.
+# Origins come from INDEXTTS_CORS_ORIGINS (comma separated, "*" allows all origins); methods and headers
+# are listed explicitly so preflight checks are plain set lookups.
+if os.environ.get("INDEXTTS_CORS_MODE", "app") != "proxy":
+    cors_origins = [origin.strip() for origin in os.environ.get("INDEXTTS_CORS_ORIGINS", "*").split(",") if origin.strip()]
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=cors_origins,
+        allow_credentials=True,
+        allow_methods=["GET", "POST"],
+        allow_headers=["Content-Type", "Authorization", "If-None-Match"],
+        expose_headers=["ETag", "Location"],
+    )
+
+# Compress JSON responses of 1 KB and more (prompt lists, task listings); level 4 gets most of the ratio of
+# higher levels at a fraction of the CPU. Audio downloads and the event stream are sent uncompressed.
+app.add_middleware(JSONGZipMiddleware, minimum_size=1024, compresslevel=4)
 
 # Include our API router
 app.include_router(router)
 
-# Create task manager instance
-task_manager = None
-
-
-@app.on_event("startup")
-async def startup_event():
-    """Initialize resources on startup"""
-    global task_manager
-    
-    # Create necessary directories
-    os.makedirs("prompts", exist_ok=True)
-    os.makedirs("outputs/tasks", exist_ok=True)
-    
-    # Initialize task manager
-    logger.info("Initializing task manager...")
-    task_manager = TaskManager()
-    # Share the task manager instance with routes.py
-    set_task_manager(task_manager)
-    logger.info("Task manager initialized")
-
-
-@app.on_event("shutdown")
-async def shutdown_event():
-    """Clean up resources on shutdown"""
-    global task_manager
-    if task_manager:
-        logger.info("Shutting down task manager...")
-        task_manager.shutdown()
-        logger.info("Task manager shutdown complete")
-
 
 if __name__ == "__main__":
+    # uvloop and the httptools parser replace the pure-Python event loop and HTTP parser; uvloop is POSIX-only
+    posix = sys.platform != "win32"
+    # Auto-reload is for development only; uvicorn ignores the worker count when it is on.
+    # Every worker process loads its own model and task manager, so GPU servers should keep one.
+    reload = os.environ.get("INDEXTTS_RELOAD", "0") == "1"
+    workers = int(os.environ.get("INDEXTTS_WORKERS", "1"))
+    # Hold idle connections long enough for clients polling task status to reuse them between polls.
+    # Connections beyond the concurrency limit, status event streams included, are answered with 503.
+    keep_alive = int(os.environ.get("INDEXTTS_KEEP_ALIVE", "30"))
+    limit_concurrency = int(os.environ.get("INDEXTTS_LIMIT_CONCURRENCY", "1024"))
     # Run the server
     uvicorn.run(
         "api_server:app",
         host="0.0.0.0",
         port=51046,
-        reload=True
+        reload=reload,
+        workers=workers,
+        loop="uvloop" if posix else "auto",
+        http="httptools" if posix else "auto",
+        timeout_keep_alive=keep_alive,
+        limit_concurrency=limit_concurrency,
+        backlog=2048
     )
@@ -1,6 +1,10 @@
+import hashlib
+import mmap
 import os
 import re
+import threading
 import time
+from collections import OrderedDict
 from subprocess import CalledProcessError
 from typing import List
 
@@ -120,9 +124,13 @@ class IndexTTS:
         print(">> TextNormalizer loaded")
         self.tokenizer = TextTokenizer(self.bpe_path, self.normalizer)
         print(">> bpe model loaded from:", self.bpe_path)
-        # 缓存参考音频mel：
-        self.cache_audio_prompt = None
-        self.cache_cond_mel = None
+        # 缓存参考音频mel：按 (路径, 修改时间, 文件大小) 保存最近使用的若干个参考音频
+        self.cond_mel_cache_size = 8
+        self._cond_mel_cache = OrderedDict()
+        self._cond_mel_lock = threading.Lock()
+        # path -> (mtime_ns, size, content digest), so prompt files are only hashed again after they change;
+        # bounded like the mel cache since webui passes a new temporary path for every upload
+        self._prompt_digests = OrderedDict()
         # 进度引用显示（可选）
         self.gr_progress = None
 
@@ -213,32 +221,74 @@ class IndexTTS:
         if self.gr_progress is not None:
             self.gr_progress(value, desc=desc)
 
+    def _prompt_digest(self, audio_prompt):
+        """
+        Hash the contents of a prompt file, reusing the previous digest while its modification time and size are unchanged.
+        """
+        st = os.stat(audio_prompt)
+        with self._cond_mel_lock:
+            known = self._prompt_digests.get(audio_prompt)
+            if known is not None:
+                self._prompt_digests.move_to_end(audio_prompt)
+        if known is not None and known[:2] == (st.st_mtime_ns, st.st_size):
+            return known[2]
+        with open(audio_prompt, "rb") as f:
+            if st.st_size == 0:
+                # mmap cannot map an empty file
+                digest = hashlib.blake2b(b"", digest_size=16).hexdigest()
+            else:
+                # Hash the mapped pages directly instead of copying the file into Python bytes
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                    digest = hashlib.blake2b(mapped, digest_size=16).hexdigest()
+        with self._cond_mel_lock:
+            self._prompt_digests[audio_prompt] = (st.st_mtime_ns, st.st_size, digest)
+            self._prompt_digests.move_to_end(audio_prompt)
+            while len(self._prompt_digests) > 4 * self.cond_mel_cache_size:
+                self._prompt_digests.popitem(last=False)
+        return digest
+
+    def get_cond_mel(self, audio_prompt, verbose=False):
+        """
+        Load the reference audio and compute its conditioning mel spectrogram on the model device.
+
+        Results are kept in a small LRU cache keyed by a hash of the file contents, so copies of the same
+        prompt share one entry, and callers may warm it from another thread before inference needs the prompt.
+        """
+        key = self._prompt_digest(audio_prompt)
+        with self._cond_mel_lock:
+            cond_mel = self._cond_mel_cache.get(key)
+            if cond_mel is not None:
+                self._cond_mel_cache.move_to_end(key)
+                return cond_mel
+
+        # 如果参考音频改变了，才需要重新生成 cond_mel, 提升速度
+        audio, sr = torchaudio.load(audio_prompt)
+        audio = torch.mean(audio, dim=0, keepdim=True)
+        if audio.shape[0] > 1:
+            audio = audio[0].unsqueeze(0)
+        audio = torchaudio.transforms.Resample(sr, 24000)(audio)
+        cond_mel = MelSpectrogramFeatures()(audio).to(self.device)
+        if verbose:
+            print(f"cond_mel shape: {cond_mel.shape}", "dtype:", cond_mel.dtype)
+
+        with self._cond_mel_lock:
+            self._cond_mel_cache[key] = cond_mel
+            self._cond_mel_cache.move_to_end(key)
+            while len(self._cond_mel_cache) > self.cond_mel_cache_size:
+                self._cond_mel_cache.popitem(last=False)
+        return cond_mel
+
     # 快速推理：对于“多句长文本”，可实现至少 2~10 倍以上的速度提升~ （First modified by sunnyboxs 2025-04-16）
-    def infer_fast(self, audio_prompt, text, output_path, verbose=False):
+    def infer_fast(self, audio_prompt, text, output_path, verbose=False, cond_mel=None):
         print(">> start fast inference...")
         self._set_gr_progress(0, "start fast inference...")
         if verbose:
             print(f"origin text:{text}")
         start_time = time.perf_counter()
 
-        # 如果参考音频改变了，才需要重新生成 cond_mel, 提升速度
-        if self.cache_cond_mel is None or self.cache_audio_prompt != audio_prompt:
-            audio, sr = torchaudio.load(audio_prompt)
-            audio = torch.mean(audio, dim=0, keepdim=True)
-            if audio.shape[0] > 1:
-                audio = audio[0].unsqueeze(0)
-            audio = torchaudio.transforms.Resample(sr, 24000)(audio)
-            cond_mel = MelSpectrogramFeatures()(audio).to(self.device)
-            cond_mel_frame = cond_mel.shape[-1]
-            if verbose:
-                print(f"cond_mel shape: {cond_mel.shape}", "dtype:", cond_mel.dtype)
-
-            self.cache_audio_prompt = audio_prompt
-            self.cache_cond_mel = cond_mel
-        else:
-            cond_mel = self.cache_cond_mel
-            cond_mel_frame = cond_mel.shape[-1]
-            pass
+        if cond_mel is None:
+            cond_mel = self.get_cond_mel(audio_prompt, verbose)
+        cond_mel_frame = cond_mel.shape[-1]
 
         auto_conditioning = cond_mel
         cond_mel_lengths = torch.tensor([cond_mel_frame], device=self.device)
@@ -396,6 +446,9 @@ class IndexTTS:
         wav = wav.cpu()  # to cpu
         if output_path:
             # 直接保存音频到指定路径中
+            if os.path.isfile(output_path):
+                os.remove(output_path)
+                print(">> remove old wav file:", output_path)
             os.makedirs(os.path.dirname(output_path), exist_ok=True)
             torchaudio.save(output_path, wav.type(torch.int16), sampling_rate)
             print(">> wav file saved to:", output_path)
@@ -406,32 +459,25 @@ class IndexTTS:
             wav_data = wav_data.numpy().T
             return (sampling_rate, wav_data)
 
-    # 原始推理模式
-    def infer(self, audio_prompt, text, output_path, verbose=False):
+    # 流式推理：逐句生成，每句解码完成后立即返回该句音频
+    def infer_stream(self, audio_prompt, text, verbose=False, cond_mel=None):
+        """
+        Synthesize text sentence by sentence, yielding each sentence's audio as soon as it is decoded.
+
+        cond_mel may be passed (see get_cond_mel) to reuse the reference audio conditioning across calls.
+
+        Yields:
+            torch.Tensor: CPU waveform of shape (1, num_samples) at 24 kHz, scaled to the int16 range.
+        """
         print(">> start inference...")
         self._set_gr_progress(0, "start inference...")
         if verbose:
             print(f"origin text:{text}")
         start_time = time.perf_counter()
 
-        # 如果参考音频改变了，才需要重新生成 cond_mel, 提升速度
-        if self.cache_cond_mel is None or self.cache_audio_prompt != audio_prompt:
-            audio, sr = torchaudio.load(audio_prompt)
-            audio = torch.mean(audio, dim=0, keepdim=True)
-            if audio.shape[0] > 1:
-                audio = audio[0].unsqueeze(0)
-            audio = torchaudio.transforms.Resample(sr, 24000)(audio)
-            cond_mel = MelSpectrogramFeatures()(audio).to(self.device)
-            cond_mel_frame = cond_mel.shape[-1]
-            if verbose:
-                print(f"cond_mel shape: {cond_mel.shape}", "dtype:", cond_mel.dtype)
-
-            self.cache_audio_prompt = audio_prompt
-            self.cache_cond_mel = cond_mel
-        else:
-            cond_mel = self.cache_cond_mel
-            cond_mel_frame = cond_mel.shape[-1]
-            pass
+        if cond_mel is None:
+            cond_mel = self.get_cond_mel(audio_prompt, verbose)
+        cond_mel_frame = cond_mel.shape[-1]
 
         auto_conditioning = cond_mel
         text_tokens_list = self.tokenizer.tokenize(text)
@@ -455,7 +501,7 @@ class IndexTTS:
         sampling_rate = 24000
         # lang = "EN"
         # lang = "ZH"
-        wavs = []
+        wav_samples = 0
         gpt_gen_time = 0
         gpt_forward_time = 0
         bigvgan_time = 0
@@ -526,12 +572,14 @@ class IndexTTS:
 
                 wav = torch.clamp(32767 * wav, -32767.0, 32767.0)
                 print(f"wav shape: {wav.shape}", "min:", wav.min(), "max:", wav.max())
-                # wavs.append(wav[:, :-512])
-                wavs.append(wav.cpu())  # to cpu before saving
+                # wav = wav[:, :-512]
+                wav = wav.cpu()  # to cpu before saving
+            wav_samples += wav.shape[-1]
+            # yield outside of torch.no_grad() so the caller's grad mode is not affected while suspended
+            yield wav
         end_time = time.perf_counter()
 
-        wav = torch.cat(wavs, dim=1)
-        wav_length = wav.shape[-1] / sampling_rate
+        wav_length = wav_samples / sampling_rate
         print(f">> Reference audio length: {cond_mel_frame * 256 / sampling_rate:.2f} seconds")
         print(f">> gpt_gen_time: {gpt_gen_time:.2f} seconds")
         print(f">> gpt_forward_time: {gpt_forward_time:.2f} seconds")
@@ -540,6 +588,12 @@ class IndexTTS:
         print(f">> Generated audio length: {wav_length:.2f} seconds")
         print(f">> RTF: {(end_time - start_time) / wav_length:.4f}")
 
+    # 原始推理模式
+    def infer(self, audio_prompt, text, output_path, verbose=False, cond_mel=None):
+        sampling_rate = 24000
+        wavs = list(self.infer_stream(audio_prompt, text, verbose=verbose, cond_mel=cond_mel))
+        wav = torch.cat(wavs, dim=1)
+
         # save audio
         wav = wav.cpu()  # to cpu
         if output_path:
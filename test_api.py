@@ -1,81 +1,117 @@
 import os
-import time
-import requests
+import asyncio
+import json
+import httpx
 import argparse
 import shutil
 
 # Parse command line arguments
 parser = argparse.ArgumentParser(description="Test the IndexTTS API server")
-parser.add_argument("--host", default="http://localhost:8000", help="API server host")
+parser.add_argument("--host", default="http://localhost:51046", help="API server host")
 parser.add_argument("--prompt", default="sample_prompt.wav", help="Prompt audio file name")
 parser.add_argument("--text", default="你好，这是一段测试文本", help="Text to synthesize")
 args = parser.parse_args()
 
 # API base URL
-base_url = f"{args.host}/api/v1"
-
-# Step 1: Check if the server is running
-print("Testing API server health...")
-try:
-    response = requests.get(f"{base_url}/health")
-    response.raise_for_status()
-    print(f"Health check: {response.json()}")
-except Exception as e:
-    print(f"Error: {str(e)}")
-    print("Make sure the API server is running.")
-    exit(1)
-
-# Step 2: Check available prompts
-print("\nGetting available prompts...")
-response = requests.get(f"{base_url}/tts/prompts")
-prompts = response.json()["prompts"]
-print(f"Available prompts: {prompts}")
-
-# Step 3: Copy test prompt if needed
-if args.prompt not in prompts and os.path.exists(f"tests/{args.prompt}"):
-    print(f"\nCopying test prompt {args.prompt} to prompts directory...")
+base_url = f"{args.host}/api/tts"
+
+
+def copy_test_prompt(prompt: str) -> bool:
+    """Copy the test prompt into the prompts directory unless it is already there"""
+    if os.path.exists(f"prompts/{prompt}") or not os.path.exists(f"tests/{prompt}"):
+        return False
     os.makedirs("prompts", exist_ok=True)
-    shutil.copy(f"tests/{args.prompt}", f"prompts/{args.prompt}")
-    print(f"Copied {args.prompt} to prompts directory")
-
-# Step 4: Create a TTS task
-print("\nCreating TTS task...")
-output_path = f"outputs/tasks/test_{int(time.time())}.wav"
-task_data = {
-    "text": args.text,
-    "prompt_name": args.prompt,
-    "output_path": output_path,
-    "infer_mode": "普通推理"
-}
-
-response = requests.post(f"{base_url}/tts/tasks", json=task_data)
-task = response.json()
-task_id = task["task_id"]
-print(f"Created task: {task}")
-
-# Step 5: Poll task status until complete
-print("\nPolling task status...")
-max_polls = 60  # Maximum number of polls (5 minutes with 5-second interval)
-poll_interval = 5  # Seconds between polls
-
-for i in range(max_polls):
-    response = requests.get(f"{base_url}/tts/tasks/{task_id}")
-    status = response.json()
-    print(f"Task status: {status}")
-    
-    if status["status"] in ["completed", "failed"]:
-        break
-    
-    print(f"Waiting {poll_interval} seconds...")
-    time.sleep(poll_interval)
-
-# Step 6: Check the result
-if status["status"] == "completed":
-    print(f"\nTask completed successfully!")
-    print(f"Output file: {output_path}")
-    if os.path.exists(output_path):
-        print(f"File size: {os.path.getsize(output_path)} bytes")
+    shutil.copy(f"tests/{prompt}", f"prompts/{prompt}")
+    return True
+
+
+async def main():
+    # One client for every request, so the connection is kept alive instead of reopened per call;
+    # the transport retries failed connection attempts, e.g. while the server is still starting
+    transport = httpx.AsyncHTTPTransport(retries=2, limits=httpx.Limits(max_keepalive_connections=4))
+    async with httpx.AsyncClient(base_url=base_url, transport=transport, timeout=30.0) as client:
+        # Steps 1-3 do not depend on each other, so they run concurrently
+        print("Testing API server health, getting available prompts and copying the test prompt if needed...")
+        health, prompts_response, copied = await asyncio.gather(
+            client.get("/health"),
+            client.get("/prompts"),
+            asyncio.to_thread(copy_test_prompt, args.prompt),
+            return_exceptions=True
+        )
+
+        # Step 1: Check if the server is running
+        try:
+            if isinstance(health, Exception):
+                raise health
+            health.raise_for_status()
+            print(f"Health check: {health.json()}")
+        except Exception as e:
+            print(f"Error: {str(e)}")
+            print("Make sure the API server is running.")
+            exit(1)
+
+        # Step 2: Check available prompts
+        if isinstance(prompts_response, Exception):
+            raise prompts_response
+        prompts = prompts_response.json()["prompts"]
+        print(f"Available prompts: {prompts}")
+
+        # Step 3: Copy test prompt if needed
+        if isinstance(copied, Exception):
+            raise copied
+        if copied:
+            print(f"Copied {args.prompt} to prompts directory")
+
+        # Step 4: Create a TTS task
+        print("\nCreating TTS task...")
+        # output_path is the output directory; the server picks the file name
+        task_data = {
+            "text": args.text,
+            "prompt_path": args.prompt,
+            "output_path": "outputs/tasks",
+            "infer_mode": "普通推理"
+        }
+
+        response = await client.post("/tasks", json=task_data)
+        response.raise_for_status()
+        task = response.json()
+        task_id = task["task_id"]
+        print(f"Created task: {task}")
+        if task.get("eta_ms") is not None:
+            print(f"Estimated time to completion: {task['eta_ms'] / 1000:.1f} seconds")
+
+        # Step 5: Follow the task's status events until it completes
+        print("\nWaiting for task status events...")
+        timeout = 300  # Give up after 5 minutes
+        status = task
+
+        async def follow_events():
+            nonlocal status
+            # The server pushes one event per status change and closes the stream once the task is done
+            async with client.stream("GET", f"/tasks/{task_id}/events", timeout=httpx.Timeout(10.0, read=None)) as response:
+                response.raise_for_status()
+                async for line in response.aiter_lines():
+                    if line.startswith("data: "):
+                        status = json.loads(line[len("data: "):])
+                        print(f"Task status: {status}")
+
+        try:
+            await asyncio.wait_for(follow_events(), timeout)
+        except asyncio.TimeoutError:
+            print(f"No result after {timeout} seconds")
+
+    # Step 6: Check the result
+    if status["status"] == "completed":
+        print(f"\nTask completed successfully!")
+        output_path = status["output_path"]
+        print(f"Output file: {output_path}")
+        if os.path.exists(output_path):
+            print(f"File size: {os.path.getsize(output_path)} bytes")
+        else:
+            print("Warning: Output file not found")
     else:
-        print("Warning: Output file not found")
-else:
-    print(f"\nTask did not complete successfully: {status}")
+        print(f"\nTask did not complete successfully: {status}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())